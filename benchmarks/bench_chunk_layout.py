@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compare the chunk layouts of result variables.
+
+Writes the same node variable with each layout and reports the time to read
+all time steps one by one as well as the time to read the full history of a
+few random nodes. The history and balanced layouts are additionally planned
+without ``expected_steps``, i.e. for the default number of steps.
+
+    $ python benchmarks/bench_chunk_layout.py --nodes-per-side 60 --steps 100
+
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from pyexodus import exodus
+
+from common import Timer, hex_mesh, node_field, print_table
+
+# Layout and whether to pass the actual number of steps as expected_steps.
+LAYOUTS = [
+    ("snapshot", True),
+    ("history", True),
+    ("balanced", True),
+    ("history", False),
+    ("balanced", False),
+]
+
+
+def write(
+    filename,
+    coords,
+    connectivity,
+    num_steps,
+    layout,
+    compression,
+    expected_steps,
+):
+    with exodus(
+        filename,
+        mode="w",
+        title="Benchmark",
+        numDims=3,
+        numNodes=len(coords[0]),
+        numElems=len(connectivity),
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=0,
+        io_size=8,
+        compression=compression,
+        expected_steps=expected_steps,
+        chunk_layout=layout,
+    ) as e:
+        e.put_coords(*coords)
+        e.put_elem_blk_info(1, "HEX", len(connectivity), 8, 0)
+        e.put_elem_connectivity(1, connectivity, shift_indices=1)
+        e.set_node_variable_number(1)
+        e.put_node_variable_name("u", 1)
+        with e.timestep_writer(buffer_steps=num_steps) as w:
+            for step in range(1, num_steps + 1):
+                w.put_time(step, float(step))
+                w.put_node_variable_values("u", step, node_field(coords, step))
+
+
+def read_snapshots(filename, num_steps):
+    with exodus(filename, mode="r") as e:
+        for step in range(1, num_steps + 1):
+            e.get_node_variable_values("u", step)
+
+
+def read_histories(filename, nodes):
+    with exodus(filename, mode="r") as e:
+        var = e._f.variables["vals_nod_var1"]
+        for node in nodes:
+            var[:, node]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--nodes-per-side", type=int, default=40)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--histories", type=int, default=20)
+    parser.add_argument("--gzip", type=int, default=None)
+    args = parser.parse_args()
+
+    coords, connectivity = hex_mesh(args.nodes_per_side)
+    nodes = np.random.RandomState(12345).randint(
+        0, len(coords[0]), args.histories
+    )
+    compression = ("gzip", args.gzip) if args.gzip is not None else None
+    tmpdir = tempfile.mkdtemp()
+    rows = []
+    try:
+        for layout, known_steps in LAYOUTS:
+            expected_steps = args.steps if known_steps else None
+            filename = os.path.join(tmpdir, "%s.e" % layout)
+            with Timer() as t_write:
+                write(
+                    filename,
+                    coords,
+                    connectivity,
+                    args.steps,
+                    layout,
+                    compression,
+                    expected_steps,
+                )
+            with Timer() as t_snap:
+                read_snapshots(filename, args.steps)
+            with Timer() as t_hist:
+                read_histories(filename, nodes)
+            with exodus(filename, mode="r") as e:
+                chunks = e._f.variables["vals_nod_var1"].chunks
+            rows.append(
+                [
+                    layout,
+                    "%i" % args.steps if known_steps else "default",
+                    "x".join(str(_i) for _i in chunks),
+                    "%.3f" % t_write.elapsed,
+                    "%.3f" % t_snap.elapsed,
+                    "%.3f" % t_hist.elapsed,
+                ]
+            )
+            os.remove(filename)
+    finally:
+        shutil.rmtree(tmpdir)
+
+    print(
+        "%i nodes, %i steps, %i node histories"
+        % (len(coords[0]), args.steps, args.histories)
+    )
+    print_table(
+        [
+            "layout",
+            "expected_steps",
+            "chunks",
+            "write [s]",
+            "snapshots [s]",
+            "histories [s]",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compare the compression filters on a synthetic HEX mesh.
+
+Reports the write and read throughput (in terms of uncompressed data) and
+the compression ratio of each filter. The hdf5plugin filters are skipped
+if the package is not installed.
+
+    $ python benchmarks/bench_compression.py --nodes-per-side 60 --steps 20
+
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from pyexodus import exodus
+
+from common import Timer, hex_mesh, payload_bytes, print_table, write_mesh
+
+FILTERS = [
+    ("none", None),
+    ("gzip-1", ("gzip", 1)),
+    ("gzip-4", ("gzip", 4)),
+    ("lzf", ("lzf", None)),
+    ("zstd-3", ("zstd", 3)),
+    ("lz4", ("lz4", None)),
+    ("blosc-lz4", ("blosc", 5)),
+    ("blosc-zstd-bit", ("blosc:zstd", {"clevel": 3, "shuffle": "bit"})),
+]
+
+
+def read_all(filename):
+    with exodus(filename, mode="r") as e:
+        e.get_coords()
+        e.get_elem_connectivity(1)
+        for step in range(1, len(e._f.variables["time_whole"]) + 1):
+            e.get_node_variable_values("u", step)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--nodes-per-side", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument(
+        "--filters",
+        nargs="+",
+        choices=[_i[0] for _i in FILTERS],
+        default=[_i[0] for _i in FILTERS],
+    )
+    args = parser.parse_args()
+
+    try:
+        import hdf5plugin  # NOQA
+
+        has_plugins = True
+    except ImportError:
+        has_plugins = False
+
+    coords, connectivity = hex_mesh(args.nodes_per_side)
+    nbytes = payload_bytes(coords, connectivity, args.steps)
+    tmpdir = tempfile.mkdtemp()
+    rows = []
+    try:
+        for name, compression in FILTERS:
+            if name not in args.filters:
+                continue
+            if (
+                compression
+                and compression[0] not in ("gzip", "lzf")
+                and not has_plugins
+            ):
+                print("Skipping %s: hdf5plugin is not installed." % name)
+                continue
+            filename = os.path.join(tmpdir, "%s.e" % name)
+            with Timer() as t_write:
+                write_mesh(
+                    filename,
+                    coords,
+                    connectivity,
+                    num_steps=args.steps,
+                    io_size=8,
+                    compression=compression,
+                )
+            with Timer() as t_read:
+                read_all(filename)
+            mb = nbytes / 1024.0 ** 2
+            rows.append(
+                [
+                    name,
+                    "%.1f" % (mb / t_write.elapsed),
+                    "%.1f" % (mb / t_read.elapsed),
+                    "%.2f" % (nbytes / float(os.path.getsize(filename))),
+                ]
+            )
+            os.remove(filename)
+    finally:
+        shutil.rmtree(tmpdir)
+
+    print(
+        "%i nodes, %i elements, %i steps, %.1f MB of data"
+        % (len(coords[0]), len(connectivity), args.steps, nbytes / 1024.0 ** 2)
+    )
+    print_table(["filter", "write MB/s", "read MB/s", "ratio"], rows)
+
+
+if __name__ == "__main__":
+    main()
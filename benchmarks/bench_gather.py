@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Time random access reads of coordinates and connectivity.
+
+Reads the coordinates of random nodes and the connectivity of random
+elements with different values of the ``gather_gap`` argument and compares
+them to h5py's fancy indexing of the sorted and unique indices.
+
+    $ python benchmarks/bench_gather.py --nodes-per-side 100 --lookups 100000
+
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from pyexodus import exodus
+
+from common import Timer, hex_mesh, print_table, write_mesh
+
+GAPS = [0, 4096, 64 * 1024, 1024 ** 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--nodes-per-side", type=int, default=60)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--gzip", type=int, default=None)
+    args = parser.parse_args()
+
+    coords, connectivity = hex_mesh(args.nodes_per_side)
+    rs = np.random.RandomState(12345)
+    nodes = rs.randint(1, len(coords[0]) + 1, args.lookups)
+    elems = rs.randint(1, len(connectivity) + 1, args.lookups)
+    compression = ("gzip", args.gzip) if args.gzip is not None else None
+
+    tmpdir = tempfile.mkdtemp()
+    rows = []
+    try:
+        filename = os.path.join(tmpdir, "mesh.e")
+        write_mesh(filename, coords, connectivity, compression=compression)
+
+        with exodus(filename, mode="r") as e:
+            with Timer() as t_nodes:
+                _n = np.unique(nodes - 1).tolist()
+                for _i in ["coordx", "coordy", "coordz"]:
+                    e._f.variables[_i][_n]
+            with Timer() as t_elems:
+                e._f.variables["connect1"][np.unique(elems - 1).tolist()]
+        rows.append(
+            [
+                "h5py (sorted)",
+                "%.3f" % t_nodes.elapsed,
+                "%.3f" % t_elems.elapsed,
+            ]
+        )
+
+        for gap in GAPS:
+            with exodus(filename, mode="r", gather_gap=gap) as e:
+                with Timer() as t_nodes:
+                    e.get_coord(nodes)
+                with Timer() as t_elems:
+                    e.get_elem_connectivity(1, indices=elems)
+            rows.append(
+                [
+                    "gather_gap=%i" % gap,
+                    "%.3f" % t_nodes.elapsed,
+                    "%.3f" % t_elems.elapsed,
+                ]
+            )
+    finally:
+        shutil.rmtree(tmpdir)
+
+    print(
+        "%i nodes, %i elements, %i random lookups each"
+        % (len(coords[0]), len(connectivity), args.lookups)
+    )
+    print_table(["method", "get_coord [s]", "connectivity [s]"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark the read and write hot paths on synthetic meshes.
+
+Generates structured QUAD and HEX meshes with the requested number of nodes
+and reports the wall time, the throughput, and the peak memory allocated
+by each operation. Every operation runs twice as tracing the memory
+allocations slows it down: once to time it and once to trace the memory. The results can be stored as JSON to compare them
+against a baseline.
+
+    $ python benchmarks/bench_hot_paths.py --nodes 1e4 1e6 1e8 --steps 10
+    $ python benchmarks/bench_hot_paths.py --json baseline.json
+
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from pyexodus import exodus
+
+from common import hex_mesh, measure, node_field, print_table, quad_mesh
+
+# Element type, mesh generator, dimensions, and the side of the elements in
+# the first row/layer facing the domain boundary.
+MESHES = {
+    "QUAD": ("QUAD", quad_mesh, 2, 1),
+    "HEX": ("HEX", hex_mesh, 3, 5),
+}
+
+
+def run(filename, element, num_nodes, num_steps, compression):
+    """
+    Run all benchmarks for one mesh.
+
+    Returns a list of ``(operation, seconds, bytes, peak_memory)`` tuples.
+    """
+    elem_type, generator, num_dims, side = MESHES[element]
+    nodes_per_side = max(2, int(round(num_nodes ** (1.0 / num_dims))))
+    coords, connectivity = generator(nodes_per_side)
+    num_nodes = len(coords[0])
+    num_elems = len(connectivity)
+    # The first row/layer of elements.
+    boundary = np.arange(1, (nodes_per_side - 1) ** (num_dims - 1) + 1)
+    # 1 % of the elements.
+    rng = np.random.RandomState(12345)
+    indices = np.unique(
+        rng.randint(1, num_elems + 1, max(1, num_elems // 100))
+    )
+
+    results = []
+
+    def _add(name, func, nbytes=None):
+        """
+        Measure ``func``. ``nbytes`` defaults to the size of its result.
+        """
+        elapsed, peak, result = measure(func)
+        if nbytes is None:
+            nbytes = result.nbytes
+        results.append((name, elapsed, nbytes, peak))
+
+    e = exodus(
+        filename,
+        mode="w",
+        title="Benchmark",
+        numDims=num_dims,
+        numNodes=num_nodes,
+        numElems=num_elems,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=8,
+        compression=compression,
+    )
+    _add(
+        "put_coords",
+        lambda: e.put_coords(*coords),
+        sum(_c.nbytes for _c in coords),
+    )
+
+    e.put_elem_blk_info(1, elem_type, num_elems, connectivity.shape[1], 0)
+    # Shift outside of the measurement to compare with shift_indices.
+    shifted = connectivity + 1
+    _add(
+        "put_elem_connectivity",
+        lambda: e.put_elem_connectivity(1, shifted),
+        connectivity.nbytes,
+    )
+    _add(
+        "put_elem_connectivity(shift)",
+        lambda: e.put_elem_connectivity(1, connectivity, shift_indices=1),
+        connectivity.nbytes,
+    )
+
+    e.put_side_set_params(1, len(boundary), 0)
+    e.put_side_set(1, boundary, np.ones_like(boundary) * side)
+
+    e.set_node_variable_number(1)
+    e.put_node_variable_name("u", 1)
+    fields = [node_field(coords, _i) for _i in range(2)]
+
+    def _put_steps():
+        for step in range(1, num_steps + 1):
+            e.put_time(step, float(step))
+            e.put_node_variable_values("u", step, fields[step % 2])
+
+    _add("put_node_variable_values", _put_steps, num_steps * fields[0].nbytes)
+    e.close()
+
+    with exodus(filename, mode="r") as e:
+
+        def _get_steps():
+            for step in range(1, num_steps + 1):
+                e.get_node_variable_values("u", step)
+
+        _add(
+            "get_node_variable_values",
+            _get_steps,
+            num_steps * fields[0].nbytes,
+        )
+        _add("get_side_set_node_list", lambda: e.get_side_set_node_list(1)[1])
+        _add(
+            "get_elem_connectivity(indices)",
+            lambda: e.get_elem_connectivity(1, indices=indices)[0],
+        )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--nodes",
+        type=float,
+        nargs="+",
+        default=[1e4, 1e5, 1e6],
+        help="Approximate number of nodes per mesh.",
+    )
+    parser.add_argument(
+        "--elements",
+        nargs="+",
+        choices=sorted(MESHES),
+        default=sorted(MESHES),
+    )
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--gzip", type=int, default=None)
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    compression = ("gzip", args.gzip) if args.gzip is not None else None
+    tmpdir = tempfile.mkdtemp()
+    rows = []
+    records = []
+    try:
+        for element in args.elements:
+            for num_nodes in args.nodes:
+                filename = os.path.join(tmpdir, "bench.e")
+                results = run(
+                    filename, element, int(num_nodes), args.steps, compression
+                )
+                os.remove(filename)
+                for name, seconds, nbytes, peak in results:
+                    mb = nbytes / 1024.0 ** 2
+                    rows.append(
+                        [
+                            element,
+                            "%.0e" % num_nodes,
+                            name,
+                            "%.4f" % seconds,
+                            "%.1f" % (mb / seconds) if seconds else "-",
+                            "%.1f" % (peak / 1024.0 ** 2),
+                        ]
+                    )
+                    records.append(
+                        {
+                            "element": element,
+                            "nodes": int(num_nodes),
+                            "operation": name,
+                            "seconds": seconds,
+                            "bytes": nbytes,
+                            "peak_memory": peak,
+                        }
+                    )
+    finally:
+        shutil.rmtree(tmpdir)
+
+    print_table(
+        ["mesh", "nodes", "operation", "time [s]", "MB/s", "peak [MB]"], rows
+    )
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(
+                {"steps": args.steps, "gzip": args.gzip, "results": records},
+                fh,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measure how long importing pyexodus takes.
+
+Every import happens in a fresh interpreter. Reports the median wall time of
+importing numpy alone and of importing pyexodus (which includes numpy) and
+optionally fails if pyexodus adds more than a given time on top of numpy.
+
+    $ python benchmarks/bench_import.py --repeat 20 --max-overhead-ms 50
+
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from common import print_table
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def time_import(module, repeat):
+    """
+    Median time in milliseconds to import a module in a new interpreter.
+    """
+    code = (
+        "import time; t = time.perf_counter(); import %s; "
+        "print(time.perf_counter() - t)" % module
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [ROOT] + [_i for _i in [env.get("PYTHONPATH")] if _i]
+    )
+    times = sorted(
+        float(subprocess.check_output([sys.executable, "-c", code], env=env))
+        * 1000.0
+        for _ in range(repeat)
+    )
+    return times[len(times) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--max-overhead-ms",
+        type=float,
+        default=None,
+        help="Exit with an error if pyexodus takes longer than this to "
+        "import on top of numpy.",
+    )
+    args = parser.parse_args()
+
+    # Warm up the file system caches and the bytecode caches.
+    time_import("pyexodus", 1)
+
+    numpy_ms = time_import("numpy", args.repeat)
+    pyexodus_ms = time_import("pyexodus", args.repeat)
+    overhead_ms = pyexodus_ms - numpy_ms
+    print_table(
+        ["import", "median [ms]"],
+        [
+            ["numpy", "%.1f" % numpy_ms],
+            ["pyexodus", "%.1f" % pyexodus_ms],
+            ["overhead", "%.1f" % overhead_ms],
+        ],
+    )
+    if args.max_overhead_ms is not None and overhead_ms > args.max_overhead_ms:
+        sys.exit(
+            "Importing pyexodus takes %.1f ms longer than importing numpy "
+            "(limit: %.1f ms)." % (overhead_ms, args.max_overhead_ms)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Shared helpers for the pyexodus benchmarks.
+
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def hex_mesh(nodes_per_side):
+    """
+    Structured HEX mesh of the unit cube.
+
+    Returns a tuple of the three coordinate arrays and the 0-based
+    connectivity array with shape ``(num_elems, 8)``.
+
+    :type nodes_per_side: int
+    :param nodes_per_side: The number of nodes along each axis.
+    """
+    n = nodes_per_side
+    _c = np.linspace(0.0, 1.0, n)
+    z, y, x = np.meshgrid(_c, _c, _c, indexing="ij")
+
+    # Node index of the first corner of each element.
+    _i = np.arange(n - 1)
+    first = (
+        _i[:, None, None] * n * n + _i[None, :, None] * n + _i[None, None, :]
+    ).ravel()
+    # Exodus HEX8 node ordering.
+    offsets = np.array(
+        [0, 1, n + 1, n, n * n, n * n + 1, n * n + n + 1, n * n + n]
+    )
+    connectivity = (first[:, None] + offsets[None, :]).astype(np.int32)
+    return (x.ravel(), y.ravel(), z.ravel()), connectivity
+
+
+def quad_mesh(nodes_per_side):
+    """
+    Structured QUAD mesh of the unit square.
+
+    Returns a tuple of the three coordinate arrays (z is always zero) and
+    the 0-based connectivity array with shape ``(num_elems, 4)``.
+
+    :type nodes_per_side: int
+    :param nodes_per_side: The number of nodes along each axis.
+    """
+    n = nodes_per_side
+    _c = np.linspace(0.0, 1.0, n)
+    y, x = np.meshgrid(_c, _c, indexing="ij")
+
+    _i = np.arange(n - 1)
+    first = (_i[:, None] * n + _i[None, :]).ravel()
+    # Exodus QUAD4 node ordering.
+    offsets = np.array([0, 1, n + 1, n])
+    connectivity = (first[:, None] + offsets[None, :]).astype(np.int32)
+    return (x.ravel(), y.ravel(), np.zeros(n * n)), connectivity
+
+
+def node_field(coords, step):
+    """
+    A smooth time dependent field that compresses like real results.
+    """
+    x, y, z = coords
+    return np.sin(2 * np.pi * (x + 0.01 * step)) * np.cos(np.pi * y) + 0.1 * z
+
+
+def write_mesh(filename, coords, connectivity, num_steps=0, **kwargs):
+    """
+    Write a mesh with one node variable to an exodus file.
+
+    Additional keyword arguments are passed to :class:`pyexodus.exodus`.
+    """
+    # Imported here so benchmarks that only need the other helpers do not
+    # require pyexodus to be importable.
+    from pyexodus import exodus
+
+    num_nodes = len(coords[0])
+    with exodus(
+        filename,
+        mode="w",
+        title="Benchmark",
+        numDims=3,
+        numNodes=num_nodes,
+        numElems=len(connectivity),
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=0,
+        **kwargs
+    ) as e:
+        e.put_coords(*coords)
+        e.put_elem_blk_info(1, "HEX", len(connectivity), 8, 0)
+        e.put_elem_connectivity(1, connectivity, shift_indices=1)
+        if num_steps:
+            e.set_node_variable_number(1)
+            e.put_node_variable_name("u", 1)
+            for step in range(1, num_steps + 1):
+                e.put_time(step, float(step))
+                e.put_node_variable_values("u", step, node_field(coords, step))
+
+
+def payload_bytes(coords, connectivity, num_steps=0):
+    """
+    The number of bytes :func:`write_mesh` writes in double precision.
+    """
+    return (
+        sum(_c.nbytes for _c in coords)
+        + connectivity.nbytes
+        + num_steps * len(coords[0]) * 8
+    )
+
+
+def measure(func):
+    """
+    Measure the wall time in seconds and the peak memory allocated in bytes
+    of calling ``func`` without arguments.
+
+    The function is called twice: once to time it and once with
+    :mod:`tracemalloc`, which also sees the allocations of numpy, tracing
+    the memory. Tracing slows down the call so it must not be timed.
+    Returns ``(elapsed, peak, result)`` with the result of the first call.
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak, result
+
+
+class Timer(object):
+    """
+    Context manager measuring the wall time in seconds.
+    """
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.elapsed = time.perf_counter() - self._start
+
+
+def print_table(header, rows):
+    """
+    Print rows of values as an aligned table.
+    """
+    rows = [[str(_i) for _i in _r] for _r in rows]
+    widths = [
+        max(len(_r[_i]) for _r in [header] + rows) for _i in range(len(header))
+    ]
+    for _r in [header, ["-" * _w for _w in widths]] + rows:
+        print("  ".join(_v.rjust(_w) for _v, _w in zip(_r, widths)))
@@ -9,6 +9,8 @@
 from __future__ import absolute_import
 
 from .core import exodus  # NOQA
-from .version import get_git_version
+from .version import read_release_version
 
-__version__ = get_git_version()
+# Determined when installing the package (see setup.py) so importing does
+# not have to call git.
+__version__ = read_release_version() or "0.0.0-tar/zipball"
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Opt-in instrumentation of :class:`pyexodus.exodus` objects.
+
+The public methods of an instrumented object are wrapped on the instance
+and the underlying file is replaced by a proxy timing every read and write
+of its variables as well as the resizes of dimensions.
+
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+from __future__ import absolute_import
+
+import copy
+import functools
+import inspect
+import threading
+import time
+
+import numpy as np
+
+
+class Stats(object):
+    """
+    Thread-safe collection of the statistics of a file.
+
+    :param callback: Optional callable called with a dictionary describing
+        each recorded event.
+    """
+
+    def __init__(self, callback=None):
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._stats = {"methods": {}, "datasets": {}, "resizes": {}}
+
+    def _emit(self, event):
+        if self._callback is not None:
+            self._callback(event)
+
+    def record_method(self, name, seconds):
+        with self._lock:
+            _s = self._stats["methods"].setdefault(
+                name, {"calls": 0, "time": 0.0}
+            )
+            _s["calls"] += 1
+            _s["time"] += seconds
+        self._emit({"type": "method", "name": name, "time": seconds})
+
+    def record_dataset(self, name, operation, nbytes, seconds):
+        with self._lock:
+            _s = self._stats["datasets"].setdefault(
+                name,
+                {
+                    "reads": 0,
+                    "writes": 0,
+                    "bytes_read": 0,
+                    "bytes_written": 0,
+                    "time": 0.0,
+                },
+            )
+            if operation == "read":
+                _s["reads"] += 1
+                _s["bytes_read"] += nbytes
+            else:
+                _s["writes"] += 1
+                _s["bytes_written"] += nbytes
+            _s["time"] += seconds
+        self._emit(
+            {
+                "type": operation,
+                "name": name,
+                "bytes": nbytes,
+                "time": seconds,
+            }
+        )
+
+    def record_resize(self, name, size, seconds):
+        with self._lock:
+            _s = self._stats["resizes"].setdefault(
+                name, {"count": 0, "time": 0.0}
+            )
+            _s["count"] += 1
+            _s["time"] += seconds
+        self._emit(
+            {"type": "resize", "name": name, "size": size, "time": seconds}
+        )
+
+    def as_dict(self):
+        with self._lock:
+            return copy.deepcopy(self._stats)
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return np.asarray(value).nbytes
+
+
+class InstrumentedVariable(object):
+    """
+    Proxy of a variable recording all reads and writes.
+    """
+
+    def __init__(self, variable, name, stats):
+        self._variable = variable
+        self._name = name
+        self._stats = stats
+
+    def __getitem__(self, key):
+        start = time.perf_counter()
+        value = self._variable[key]
+        elapsed = time.perf_counter() - start
+        self._stats.record_dataset(self._name, "read", _nbytes(value), elapsed)
+        return value
+
+    def __setitem__(self, key, value):
+        start = time.perf_counter()
+        self._variable[key] = value
+        elapsed = time.perf_counter() - start
+        self._stats.record_dataset(
+            self._name, "write", _nbytes(value), elapsed
+        )
+
+    def read_direct(self, dest, source_sel=None):
+        start = time.perf_counter()
+        h5ds = getattr(self._variable, "_h5ds", None)
+        if h5ds is None:
+            dest[...] = self._variable[source_sel]
+        else:
+            h5ds.read_direct(dest, source_sel)
+        elapsed = time.perf_counter() - start
+        self._stats.record_dataset(self._name, "read", dest.nbytes, elapsed)
+
+    def __len__(self):
+        return len(self._variable)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self[...], dtype=dtype)
+
+    def __getattr__(self, item):
+        return getattr(self._variable, item)
+
+
+class _InstrumentedVariables(object):
+    """
+    Proxy of the mapping of variables of a file.
+    """
+
+    def __init__(self, variables, stats):
+        self._variables = variables
+        self._stats = stats
+        self._proxies = {}
+
+    def __getitem__(self, name):
+        variable = self._variables[name]
+        proxy = self._proxies.get(name)
+        if proxy is None or proxy._variable is not variable:
+            proxy = InstrumentedVariable(variable, name, self._stats)
+            self._proxies[name] = proxy
+        return proxy
+
+    def __contains__(self, name):
+        return name in self._variables
+
+    def __iter__(self):
+        return iter(self._variables)
+
+    def __len__(self):
+        return len(self._variables)
+
+    def keys(self):
+        return self._variables.keys()
+
+    def items(self):
+        return [(_k, self[_k]) for _k in self._variables]
+
+    def values(self):
+        return [self[_k] for _k in self._variables]
+
+
+class InstrumentedFile(object):
+    """
+    Proxy of an ``h5netcdf`` or netCDF-3 file recording all variable
+    accesses and dimension resizes.
+    """
+
+    def __init__(self, file, stats):
+        self._file = file
+        self._stats = stats
+        self._instrumented_variables = _InstrumentedVariables(
+            file.variables, stats
+        )
+
+    @property
+    def variables(self):
+        return self._instrumented_variables
+
+    def __getitem__(self, name):
+        return self._instrumented_variables[name]
+
+    def resize_dimension(self, dimension, size):
+        start = time.perf_counter()
+        self._file.resize_dimension(dimension, size)
+        elapsed = time.perf_counter() - start
+        self._stats.record_resize(dimension, size, elapsed)
+
+    def __getattr__(self, item):
+        return getattr(self._file, item)
+
+
+def instrument_methods(obj, stats, exclude=()):
+    """
+    Wrap all public methods of an object on the instance to record their
+    number of calls and wall times.
+
+    :param obj: The object.
+    :type stats: :class:`Stats`
+    :param stats: Where to record the calls.
+    :param exclude: Names of methods not to wrap.
+    """
+    for name, _ in inspect.getmembers(type(obj), inspect.isfunction):
+        if name.startswith("_") or name in exclude:
+            continue
+        method = getattr(obj, name)
+
+        def _wrap(method, name):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    stats.record_method(name, time.perf_counter() - start)
+
+            return wrapper
+
+        setattr(obj, name, _wrap(method, name))
+
+
+def instrument_direct_chunk_writes(method, stats):
+    """
+    Wrap :meth:`pyexodus.exodus._write_chunks_direct` to record the writes
+    bypassing the variables.
+    """
+
+    @functools.wraps(method)
+    def wrapper(var_name, h5ds, start, values):
+        t = time.perf_counter()
+        written = method(var_name, h5ds, start, values)
+        if written:
+            stats.record_dataset(
+                var_name, "write", values.nbytes, time.perf_counter() - t
+            )
+        return written
+
+    return wrapper
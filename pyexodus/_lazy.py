@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Array-like proxies of variables that only read what is indexed.
+
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+from __future__ import absolute_import
+
+import numpy as np
+
+
+class LazyArray(object):
+    """
+    Read-only proxy of a variable or of a single row of it.
+
+    Indexing reads only the selected hyperslab and returns a
+    :class:`numpy.ndarray`. Converting it to an array, e.g. with
+    :func:`numpy.asarray`, reads everything. The proxy can only be read as
+    long as the file is open.
+
+    :param variable: The ``h5netcdf`` or netCDF-3 variable.
+    :type row: int
+    :param row: If given, the proxy only represents this 0-based index of
+        the first axis, e.g. a single time step.
+    """
+
+    def __init__(self, variable, row=None):
+        self._variable = variable
+        self._row = row
+
+    @property
+    def shape(self):
+        shape = tuple(self._variable.shape)
+        if self._row is not None:
+            return shape[1:]
+        return shape
+
+    @property
+    def dtype(self):
+        return self._variable.dtype
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def __len__(self):
+        if not self.shape:
+            raise TypeError("len() of unsized object")
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if self._row is None:
+            return self._variable[key]
+        if not isinstance(key, tuple):
+            key = (key,)
+        return self._variable[(self._row,) + key]
+
+    def __array__(self, dtype=None):
+        return np.asarray(self[...], dtype=dtype)
+
+    def __repr__(self):
+        return "<pyexodus lazy array: shape %s, dtype %s>" % (
+            self.shape,
+            self.dtype,
+        )
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Minimal reader for netCDF-3 files.
+
+Supports the classic (CDF-1), 64-bit offset (CDF-2), and 64-bit data
+(CDF-5) formats and only offers the parts of the ``h5netcdf`` interface
+that pyexodus needs to read exodus files. The header is parsed once and all
+variables are read-only strided views into a memory map of the file. Thus
+nothing is read or converted before it is actually accessed.
+
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+from __future__ import absolute_import
+
+import os
+
+import numpy as np
+
+
+_NC_DIMENSION = 10
+_NC_VARIABLE = 11
+_NC_ATTRIBUTE = 12
+
+# All values are stored big endian.
+_NC_TYPES = {
+    1: np.dtype(">i1"),
+    2: np.dtype("S1"),
+    3: np.dtype(">i2"),
+    4: np.dtype(">i4"),
+    5: np.dtype(">f4"),
+    6: np.dtype(">f8"),
+    # CDF-5 only.
+    7: np.dtype(">u1"),
+    8: np.dtype(">u2"),
+    9: np.dtype(">u4"),
+    10: np.dtype(">i8"),
+    11: np.dtype(">u8"),
+}
+
+# The number of records of files that are still being written might not
+# yet be set.
+_STREAMING = {4: 2 ** 32 - 1, 8: 2 ** 64 - 1}
+
+
+def is_netcdf3(filename):
+    """
+    Check if a file is a netCDF-3 file.
+
+    :type filename: str
+    :param filename: The filename.
+    """
+    try:
+        with open(filename, "rb") as fh:
+            magic = fh.read(4)
+    except (IOError, OSError):
+        return False
+    return magic[:3] == b"CDF" and magic[3:] in (b"\x01", b"\x02", b"\x05")
+
+
+class _HeaderParser(object):
+    """
+    Sequentially parses the header of a netCDF-3 file.
+    """
+
+    def __init__(self, buf):
+        self._buf = buf
+        self._pos = 4
+        version = buf[3]
+        # Size of counts and lengths.
+        self._size = 8 if version == 5 else 4
+        # Size of the variable offsets.
+        self._offset_size = 4 if version == 1 else 8
+
+    def _int(self, size):
+        value = int.from_bytes(
+            self._buf[self._pos : self._pos + size], "big"  # NOQA
+        )
+        self._pos += size
+        return value
+
+    def _bytes(self, length):
+        value = bytes(self._buf[self._pos : self._pos + length])  # NOQA
+        # Everything is padded to 4 bytes.
+        self._pos += length + (-length % 4)
+        return value
+
+    def _name(self):
+        return self._bytes(self._int(self._size)).decode("utf-8")
+
+    def _list(self, tag):
+        _t = self._int(4)
+        count = self._int(self._size)
+        if _t == 0 and count == 0:
+            return 0
+        if _t != tag:
+            raise ValueError("Invalid netCDF-3 header.")
+        return count
+
+    def num_records(self):
+        return self._int(self._size)
+
+    def dimensions(self):
+        return [
+            (self._name(), self._int(self._size))
+            for _ in range(self._list(_NC_DIMENSION))
+        ]
+
+    def attributes(self):
+        attrs = {}
+        for _ in range(self._list(_NC_ATTRIBUTE)):
+            name = self._name()
+            dtype = _NC_TYPES[self._int(4)]
+            count = self._int(self._size)
+            data = self._bytes(count * dtype.itemsize)
+            if dtype.kind == "S":
+                attrs[name] = np.bytes_(data.rstrip(b"\x00"))
+            else:
+                attrs[name] = np.frombuffer(data, dtype=dtype).astype(
+                    dtype.newbyteorder("=")
+                )
+        return attrs
+
+    def variables(self):
+        variables = []
+        for _ in range(self._list(_NC_VARIABLE)):
+            name = self._name()
+            dim_ids = [
+                self._int(self._size) for _ in range(self._int(self._size))
+            ]
+            attrs = self.attributes()
+            dtype = _NC_TYPES[self._int(4)]
+            # The size is not reliable for large variables and thus
+            # computed from the shape.
+            self._int(self._size)
+            begin = self._int(self._offset_size)
+            variables.append((name, dim_ids, attrs, dtype, begin))
+        return variables
+
+
+class Variable(object):
+    """
+    A variable in a netCDF-3 file.
+    """
+
+    def __init__(self, name, dimensions, data, attrs):
+        self.name = name
+        self.dimensions = dimensions
+        self._data = data
+        self.attrs = attrs
+
+    @property
+    def shape(self):
+        return self._data.shape
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    @property
+    def ndim(self):
+        return self._data.ndim
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __array__(self, dtype=None):
+        return np.asarray(self._data, dtype=dtype)
+
+    def __repr__(self):
+        return "<pyexodus netCDF-3 variable %r: dimensions %s, shape %s>" % (
+            self.name,
+            self.dimensions,
+            self.shape,
+        )
+
+
+class File(object):
+    """
+    Read-only netCDF-3 file.
+
+    :type filename: str
+    :param filename: The filename.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        if not os.path.getsize(filename):
+            raise ValueError("'%s' is empty." % filename)
+        self._mm = np.memmap(filename, dtype=np.uint8, mode="r")
+
+        parser = _HeaderParser(self._mm)
+        num_records = parser.num_records()
+        dims = parser.dimensions()
+        self.attrs = parser.attributes()
+        variables = parser.variables()
+
+        dim_names = [_i[0] for _i in dims]
+        # Only the record dimension has a length of zero.
+        self.dimensions = {
+            _name: (None if _len == 0 else _len) for _name, _len in dims
+        }
+
+        def _is_record(dim_ids):
+            return bool(dim_ids) and dims[dim_ids[0]][1] == 0
+
+        # All record variables are interleaved record by record. Each
+        # variable is padded to 4 bytes unless there is only one.
+        record_vars = [_v for _v in variables if _is_record(_v[1])]
+        sizes = {}
+        for name, dim_ids, _, dtype, _ in record_vars:
+            size = dtype.itemsize
+            for _i in dim_ids[1:]:
+                size *= dims[_i][1]
+            if len(record_vars) > 1:
+                size += -size % 4
+            sizes[name] = size
+        record_size = sum(sizes.values())
+
+        if record_vars and record_size:
+            first = min(_v[4] for _v in record_vars)
+            available = (len(self._mm) - first) // record_size
+            if num_records == _STREAMING[parser._size]:
+                num_records = available
+            # Files might still be in the process of being written.
+            num_records = min(num_records, available)
+        elif num_records == _STREAMING[parser._size]:  # pragma: no cover
+            num_records = 0
+
+        self._current_dim_sizes = {
+            _name: (num_records if _len == 0 else _len) for _name, _len in dims
+        }
+
+        self.variables = {}
+        for name, dim_ids, attrs, dtype, begin in variables:
+            shape = tuple(
+                self._current_dim_sizes[dims[_i][0]] for _i in dim_ids
+            )
+            strides = []
+            _s = dtype.itemsize
+            for _n in reversed(shape):
+                strides.insert(0, _s)
+                _s *= _n
+            if _is_record(dim_ids):
+                strides[0] = record_size
+            if 0 in shape:
+                data = np.empty(shape, dtype=dtype)
+            else:
+                data = np.ndarray(
+                    shape=shape,
+                    dtype=dtype,
+                    buffer=self._mm,
+                    offset=begin,
+                    strides=tuple(strides),
+                )
+            self.variables[name] = Variable(
+                name=name,
+                dimensions=tuple(dim_names[_i] for _i in dim_ids),
+                data=data,
+                attrs=attrs,
+            )
+
+    def __getitem__(self, key):
+        return self.variables[key]
+
+    def close(self):
+        # Arrays handed out keep the memory map alive.
+        self.variables = {}
+        self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return "<pyexodus netCDF-3 file %r>" % self.filename
@@ -8,21 +8,61 @@
 """
 from __future__ import absolute_import
 
+import functools
+import itertools
 import os
 import platform
+import queue
+import re
+import threading
+import time
 import warnings
+import zlib
 
 import numpy as np
 
-import h5netcdf
+from . import _lazy, _netcdf3
 
 
-# This uses zero based indexing to be compatible with numpy. The variables
-# in the exodus files themselves are one based so keep that in mind!
-# The values are from the exodus manual.
+def _face_table(sides):
+    """
+    Convert the local node ids per side to an array padded with -1 as not
+    all sides of an element have the same number of nodes.
+    """
+    table = -np.ones((len(sides), max(len(_s) for _s in sides)), np.int32)
+    for _i, _s in enumerate(sides):
+        table[_i, : len(_s)] = _s
+    return table
+
+
+# The local node ids of each side per element type and number of nodes. This
+# uses zero based indexing to be compatible with numpy. The variables in the
+# exodus files themselves are one based so keep that in mind! The values are
+# from the exodus manual and the SEACAS library.
 _SIDE_SET_NUMBERING = {
-    "QUAD": np.array([[0, 1], [1, 2], [2, 3], [3, 0]], dtype=np.int32),
-    "HEX": np.array(
+    ("QUAD", 4): _face_table([[0, 1], [1, 2], [2, 3], [3, 0]]),
+    ("QUAD", 8): _face_table([[0, 1, 4], [1, 2, 5], [2, 3, 6], [3, 0, 7]]),
+    ("TRI", 3): _face_table([[0, 1], [1, 2], [2, 0]]),
+    ("TRI", 6): _face_table([[0, 1, 3], [1, 2, 4], [2, 0, 5]]),
+    ("SHELL", 4): _face_table(
+        [[0, 1, 2, 3], [0, 3, 2, 1], [0, 1], [1, 2], [2, 3], [3, 0]]
+    ),
+    ("TET", 4): _face_table([[0, 1, 3], [1, 2, 3], [0, 3, 2], [0, 2, 1]]),
+    ("TET", 10): _face_table(
+        [
+            [0, 1, 3, 4, 8, 7],
+            [1, 2, 3, 5, 9, 8],
+            [0, 3, 2, 7, 9, 6],
+            [0, 2, 1, 6, 5, 4],
+        ]
+    ),
+    ("WEDGE", 6): _face_table(
+        [[0, 1, 4, 3], [1, 2, 5, 4], [0, 3, 5, 2], [0, 2, 1], [3, 4, 5]]
+    ),
+    ("PYRAMID", 5): _face_table(
+        [[0, 1, 4], [1, 2, 4], [2, 3, 4], [0, 4, 3], [0, 3, 2, 1]]
+    ),
+    ("HEX", 8): _face_table(
         [
             [0, 1, 5, 4],
             [1, 2, 6, 5],
@@ -30,10 +70,364 @@ _SIDE_SET_NUMBERING = {
             [0, 4, 7, 3],
             [0, 3, 2, 1],
             [4, 5, 6, 7],
-        ],
-        dtype=np.int32,
+        ]
+    ),
+    ("HEX", 20): _face_table(
+        [
+            [0, 1, 5, 4, 8, 13, 16, 12],
+            [1, 2, 6, 5, 9, 14, 17, 13],
+            [2, 3, 7, 6, 10, 15, 18, 14],
+            [0, 4, 7, 3, 12, 19, 15, 11],
+            [0, 3, 2, 1, 11, 10, 9, 8],
+            [4, 5, 6, 7, 16, 17, 18, 19],
+        ]
+    ),
+    ("HEX", 27): _face_table(
+        [
+            [0, 1, 5, 4, 8, 13, 16, 12, 25],
+            [1, 2, 6, 5, 9, 14, 17, 13, 24],
+            [2, 3, 7, 6, 10, 15, 18, 14, 26],
+            [0, 4, 7, 3, 12, 19, 15, 11, 23],
+            [0, 3, 2, 1, 11, 10, 9, 8, 21],
+            [4, 5, 6, 7, 16, 17, 18, 19, 22],
+        ]
     ),
 }
+# The center node is not on any side.
+_SIDE_SET_NUMBERING[("QUAD", 9)] = _SIDE_SET_NUMBERING[("QUAD", 8)]
+# Triangles in 3D are triangular shells with two faces and three edges.
+_SIDE_SET_NUMBERING[("TRISHELL", 3)] = _face_table(
+    [[0, 1, 2], [0, 2, 1], [0, 1], [1, 2], [2, 0]]
+)
+_SIDE_SET_NUMBERING[("TRISHELL", 6)] = _face_table(
+    [[0, 1, 2, 3, 4, 5], [0, 2, 1, 5, 4, 3], [0, 1, 3], [1, 2, 4], [2, 0, 5]]
+)
+
+# Alternative names of the element types.
+_ELEMENT_TYPE_ALIASES = {
+    "HEXAHEDRON": "HEX",
+    "TETRA": "TET",
+    "TRIANGLE": "TRI",
+    "QUADRILATERAL": "QUAD",
+}
+
+
+def _side_set_numbering(elem_type, num_nodes, num_dims):
+    """
+    Get the local node ids of the sides of an element type.
+
+    :type elem_type: str
+    :param elem_type: The element type, e.g. ``"HEX"`` or ``"TETRA10"``.
+    :type num_nodes: int
+    :param num_nodes: The number of nodes per element.
+    :type num_dims: int
+    :param num_dims: The number of dimensions of the mesh. Just like in the
+        SEACAS library, triangles in 3D meshes are triangular shells.
+    """
+    match = re.match(r"^([A-Z]+?)\d*$", elem_type.strip().upper())
+    name = match.group(1) if match else elem_type
+    name = _ELEMENT_TYPE_ALIASES.get(name, name)
+    if name == "TRI" and num_dims == 3:
+        name = "TRISHELL"
+    try:
+        return _SIDE_SET_NUMBERING[(name, num_nodes)]
+    except KeyError:
+        raise ValueError(
+            "Side sets of elements of type '%s' with %i nodes are not "
+            "supported." % (elem_type, num_nodes)
+        )
+
+
+# Aim for chunks of roughly this size when pyexodus chooses the chunk shape
+# of a dataset itself.
+_TARGET_CHUNK_BYTES = 1024 ** 2
+
+# Number of time steps assumed by the chunk layout planner if the expected
+# number of steps is not known.
+_DEFAULT_EXPECTED_STEPS = 128
+
+_CHUNK_LAYOUTS = ("snapshot", "history", "balanced")
+
+# Rows separated by at most this many bytes are read at once when gathering
+# arbitrary rows of a dataset.
+_DEFAULT_GATHER_GAP = 64 * 1024
+
+# Default size of the blocks yielded by the iter_* methods.
+_DEFAULT_MEMORY_BUDGET = 64 * 1024 ** 2
+
+# Bits of the int64_status attribute. Same values as in exodusII.h.
+_EX_MAPS_INT64_DB = 0x0400
+_EX_IDS_INT64_DB = 0x0800
+_EX_BULK_INT64_DB = 0x1000
+_EX_ALL_INT64_DB = _EX_MAPS_INT64_DB | _EX_IDS_INT64_DB | _EX_BULK_INT64_DB
+
+
+def _check_chunk_layout(layout):
+    if layout not in _CHUNK_LAYOUTS:
+        raise ValueError(
+            "Chunk layout must be one of %s." % ", ".join(_CHUNK_LAYOUTS)
+        )
+
+
+def _plan_chunks(
+    layout, num_steps, num_columns, itemsize, target_bytes=_TARGET_CHUNK_BYTES
+):
+    """
+    Plan the chunk shape of a ``(time_step, num_columns)`` variable.
+
+    * ``"snapshot"``: Each chunk holds parts of a single step. Reading a
+      step touches as few chunks as possible.
+    * ``"history"``: Each chunk holds all steps of a few columns. Reading
+      the time history of a node or element touches a single chunk.
+    * ``"balanced"``: Tiles in between the two. The number of steps is the
+      geometric mean of the ones of the other two layouts, i.e. the square
+      root of the steps of a history chunk.
+
+    Returns a ``(steps, columns)`` tuple.
+
+    :type layout: str
+    :param layout: One of the layouts above.
+    :type num_steps: int
+    :param num_steps: The expected number of time steps.
+    :type num_columns: int
+    :param num_columns: The size of the second dimension.
+    :type itemsize: int
+    :param itemsize: The size of a single value in bytes.
+    :type target_bytes: int
+    :param target_bytes: The targeted size of a chunk in bytes.
+    """
+    _check_chunk_layout(layout)
+    target_items = max(1, target_bytes // itemsize)
+    num_steps = max(1, num_steps)
+    num_columns = max(1, num_columns)
+
+    if layout == "snapshot":
+        steps = 1
+    elif layout == "history":
+        steps = min(num_steps, target_items)
+    else:
+        steps = max(1, int(round(np.sqrt(min(num_steps, target_items)))))
+    # Use the remaining budget for the columns.
+    columns = min(num_columns, max(1, target_items // steps))
+    # Small variables: Use the full time extent if that still fits.
+    if columns == num_columns:
+        steps = min(num_steps, max(steps, target_items // num_columns))
+    return steps, columns
+
+
+def _contiguous_runs(indices, max_gap=0):
+    """
+    Split sorted and unique integers into runs of consecutive values.
+
+    Returns a list of ``(start, stop)`` tuples with an exclusive stop.
+
+    :type indices: :class:`numpy.ndarray`
+    :param indices: Sorted, unique integers.
+    :type max_gap: int
+    :param max_gap: Runs separated by at most this many missing values are
+        merged.
+    """
+    indices = np.asarray(indices)
+    if not indices.size:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) > max_gap + 1) + 1
+    starts = indices[np.concatenate([[0], breaks])]
+    stops = indices[np.concatenate([breaks - 1, [indices.size - 1]])] + 1
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+def _plan_gather(ids, num_rows, row_bytes, max_gap):
+    """
+    Plan reading arbitrary rows of a dataset with as few reads as possible.
+
+    The ids are sorted and deduplicated and the resulting runs of rows are
+    merged if at most ``max_gap`` bytes are between them as reading a few
+    unneeded rows is cheaper than an additional read.
+
+    Returns a tuple of a list of ``(start, stop)`` row ranges (0-based and
+    exclusive stop) to read into a single buffer one after another and the
+    position of each requested row in that buffer.
+
+    :type ids: :class:`numpy.ndarray`
+    :param ids: The 1-based row ids in any order, possibly with duplicates.
+    :type num_rows: int
+    :param num_rows: The number of rows of the dataset.
+    :type row_bytes: int
+    :param row_bytes: The size of a single row in bytes.
+    :type max_gap: int
+    :param max_gap: The largest gap in bytes that is read to merge ranges.
+    """
+    ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+    if ids.size and not (0 < ids.min() and ids.max() <= num_rows):
+        raise ValueError("Ids must be 0 < id <= %i." % num_rows)
+    unique, inverse = np.unique(ids - 1, return_inverse=True)
+    runs = _contiguous_runs(unique, max_gap=max_gap // max(1, row_bytes))
+
+    starts = np.array([_r[0] for _r in runs], dtype=np.int64)
+    lengths = np.array([_r[1] - _r[0] for _r in runs], dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    run = np.searchsorted(starts, unique, side="right") - 1
+    positions = offsets[run] + unique - starts[run]
+    return runs, positions[inverse.ravel()]
+
+
+def _aligned_block(size, chunk, limit):
+    """
+    Get the length of blocks along one axis of a dataset.
+
+    Returns the largest multiple of the chunk length that is not larger
+    than the limit so blocks starting at a multiple of it only touch whole
+    chunks. Only if a single chunk is larger than the limit, the limit
+    itself is returned. Never larger than the size of the axis.
+
+    :type size: int
+    :param size: The length of the axis.
+    :type chunk: int
+    :param chunk: The chunk length along the axis.
+    :type limit: int
+    :param limit: The largest acceptable block length.
+    """
+    if limit >= chunk:
+        block = limit // chunk * chunk
+    else:
+        block = max(1, limit)
+    return max(1, min(block, size))
+
+
+def _check_out(out, shape):
+    """
+    Make sure an array can be read into.
+
+    :type out: :class:`numpy.ndarray`
+    :param out: The array.
+    :type shape: tuple
+    :param shape: The required shape.
+    """
+    if not isinstance(out, np.ndarray) or out.shape != shape:
+        raise ValueError("out must be an array with shape %s." % (shape,))
+    if not out.flags.c_contiguous or not out.flags.writeable:
+        raise ValueError("out must be C-contiguous and writeable.")
+
+
+def _compression_options(compression):
+    """
+    Translate the ``compression`` argument to dataset creation options.
+
+    :type compression: tuple
+    :param compression: ``(method, option)`` or ``None``.
+    """
+    if not compression:
+        return {}
+
+    method, option = compression
+    # Anything but a name, e.g. a numeric HDF5 filter id, is passed on to
+    # h5py as is.
+    if isinstance(method, str) and (
+        method in ("zstd", "lz4") or method.startswith("blosc")
+    ):
+        try:
+            import hdf5plugin
+        except ImportError:  # pragma: no cover
+            raise ImportError(
+                "Compression with '%s' requires the hdf5plugin package."
+                % method
+            )
+        if method == "zstd":
+            opts = hdf5plugin.Zstd(clevel=3 if option is None else option)
+        elif method == "lz4":
+            opts = hdf5plugin.LZ4()
+        else:
+            if isinstance(option, dict):
+                kwargs = dict(option)
+            else:
+                kwargs = {"clevel": option}
+            if kwargs.get("clevel") is None:
+                kwargs["clevel"] = 5
+            kwargs["shuffle"] = {
+                "none": hdf5plugin.Blosc.NOSHUFFLE,
+                "byte": hdf5plugin.Blosc.SHUFFLE,
+                "bit": hdf5plugin.Blosc.BITSHUFFLE,
+            }[kwargs.get("shuffle", "byte")]
+            kwargs["cname"] = method.split(":")[1] if ":" in method else "lz4"
+            opts = hdf5plugin.Blosc(**kwargs)
+        return {
+            "chunks": True,
+            "compression": opts["compression"],
+            "compression_opts": opts["compression_opts"],
+        }
+
+    return {
+        "chunks": True,
+        "compression": method,
+        "compression_opts": option,
+    }
+
+
+def _deflate_filters(h5ds):
+    """
+    Get the deflate settings of a dataset that can be written with direct
+    chunk writes.
+
+    Returns a ``(shuffle, level)`` tuple for datasets that only use the
+    deflate filter, optionally preceded by the shuffle filter. Returns
+    ``None`` for all other datasets.
+
+    :type h5ds: :class:`h5py.Dataset`
+    :param h5ds: The dataset.
+    """
+    import h5py
+
+    if h5ds.chunks is None:
+        return None
+    plist = h5ds.id.get_create_plist()
+    codes = [plist.get_filter(_i)[0] for _i in range(plist.get_nfilters())]
+    if codes == [h5py.h5z.FILTER_DEFLATE]:
+        shuffle = False
+    elif codes == [h5py.h5z.FILTER_SHUFFLE, h5py.h5z.FILTER_DEFLATE]:
+        shuffle = True
+    else:
+        return None
+    return shuffle, plist.get_filter(len(codes) - 1)[2][0]
+
+
+def _import_h5netcdf():
+    """
+    h5netcdf (and thus h5py) is only imported when the first file is opened
+    as importing it is slow.
+    """
+    import h5netcdf
+
+    return h5netcdf
+
+
+def _try_import_hdf5plugin():
+    """
+    Importing hdf5plugin registers its filters so files compressed with
+    them can be read. It is an optional dependency.
+    """
+    try:
+        import hdf5plugin  # NOQA
+    except ImportError:  # pragma: no cover
+        pass
+
+
+def _deferrable(func):
+    """
+    Decorator for write methods that can run in the background writer.
+
+    If the file has a background writer, the call is put in its queue and
+    the method returns right away. Otherwise it is executed directly.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        writer = self._writer
+        if writer is not None and not writer.in_writer_thread():
+            writer.submit(func, self, *args, **kwargs)
+            return
+        return func(self, *args, **kwargs)
+
+    return wrapper
 
 
 class exodus(object):
@@ -44,6 +438,8 @@ class exodus(object):
     :param file: Filename
     :type mode: str
     :param mode: File mode. Must currently be ``"r"``, ``"a"``, or ``"w"``.
+        Files in the netCDF-3 classic, 64-bit offset, or 64-bit data
+        formats can only be opened with ``"r"``.
     :type array_type: str
     :param array_type: Must be ``"numpy"``.
     :type title: str
@@ -70,7 +466,113 @@ class exodus(object):
     :type compression: tuple
     :param compression: Turn on compression. Pass a tuple of
         ``(method, option)``, e.g. ``("gzip", 2)``. Slows down writing a lot
-        but the resulting files are potentially much smaller.
+        but the resulting files are potentially much smaller. The faster
+        filters from the `hdf5plugin <https://github.com/silx-kit/hdf5plugin>`_
+        package are also supported (it has to be installed to write and
+        read such files):
+
+        * ``("zstd", clevel)``
+        * ``("lz4", None)``
+        * ``("blosc", clevel)`` or ``("blosc:<cname>", clevel)`` with
+          ``cname`` being one of ``"blosclz"``, ``"lz4"``, ``"lz4hc"``,
+          ``"zlib"``, or ``"zstd"``. Uses byte shuffling - pass a dictionary
+          like ``{"clevel": 5, "shuffle": "bit"}`` as the option to use bit
+          shuffling.
+
+        Any other method, e.g. a numeric HDF5 filter id like
+        ``(32015, (3,))``, is passed on to h5py unchanged. Floating point
+        result variables of the named methods additionally use the shuffle
+        filter.
+    :type compression_workers: int
+    :param compression_workers: Only used with ``gzip`` compression. If
+        larger than one, writes of whole chunks (coordinates, connectivity,
+        and node and element variables) are compressed by this many threads
+        in parallel and directly written to the file. This can be much faster
+        than the compression in HDF5 which is single-threaded. The files
+        are identical to the ones written without this option.
+    :type write_queue_size: int
+    :param write_queue_size: If larger than zero, the time step writes
+        (:meth:`put_time`, :meth:`put_global_variable_value`,
+        :meth:`put_element_variable_values`,
+        :meth:`put_node_variable_values`, and
+        :meth:`put_node_variable_values_batch`) are performed by a
+        background thread so computation and I/O can overlap. Up to this
+        many calls are queued - further calls block until there is space
+        again. The passed arrays are not copied so they must not be modified
+        afterwards. Errors are raised by the next call or by :meth:`close`.
+    :type expected_steps: int
+    :param expected_steps: The expected number of time steps. Space for them
+        is reserved with the first time step and the time dependent
+        variables get chunks sized for this number of steps. It is fine to
+        write more or less steps. The reserved but unwritten steps are
+        removed when closing the file. If the file is not closed, e.g.
+        because the writing process dies, they remain in the result
+        variables but the time values only cover the written steps, which
+        pyexodus uses as the number of steps when reading.
+    :type chunk_layout: str or dict
+    :param chunk_layout: The chunk layout of newly created node, element,
+        and global variables. Optimizes the chunks for the expected access
+        pattern:
+
+        * ``"snapshot"``: Reading all values of single time steps.
+        * ``"history"``: Reading the time history of single nodes or
+          elements.
+        * ``"balanced"``: Tiles that are a compromise between the two.
+
+        The chunk shapes are computed from the size of the variable, the
+        expected number of steps (``expected_steps`` or 128 if not given),
+        and a target chunk size of 1 MB. Pass a dictionary mapping dataset
+        names (e.g. ``"vals_nod_var1"`` or ``"vals_elem_var2eb1"``) to
+        layouts to select it per variable. If not given, the chunk shapes
+        depend on ``expected_steps`` or are chosen by HDF5.
+    :type int64: bool
+    :param int64: Store the connectivity, side sets, and the block and side
+        set ids as 64 bit integers. Required for meshes with more than
+        2^31 - 1 nodes or elements. Existing files are always read and
+        appended to with the integer sizes they have been written with.
+    :type mmap: bool
+    :param mmap: Only for mode ``"r"``. Return read-only memory mapped
+        arrays from :meth:`get_coord`, :meth:`get_coords`, and
+        :meth:`get_elem_connectivity` for datasets that are stored
+        contiguously and without compression. Nothing is read before the
+        values are actually accessed and processes reading the same file
+        share the memory. Other datasets are read as usual. This includes
+        all time dependent variables like the node variables - they are on
+        the unlimited time dimension and thus always chunked. The arrays
+        stay valid after closing the file.
+    :type instrument: bool or callable
+    :param instrument: Record the number of calls and the wall time of all
+        public methods and the number of reads and writes, the bytes, and
+        the wall time of all accesses to the variables in the file as well
+        as the resizes of dimensions. Get them with :meth:`stats`. Pass a
+        callable to additionally have it called with a dictionary
+        describing each of these events, e.g. for tracing.
+    :type gather_gap: int
+    :param gather_gap: Reads of arbitrary nodes or elements
+        (:meth:`get_coord` with multiple indices,
+        :meth:`get_elem_connectivity` with ``indices``, and
+        :meth:`get_side_set_node_list`) sort and deduplicate the indices and
+        read runs of consecutive rows. Runs separated by at most this many
+        bytes are merged into a single read. Defaults to 64 KB.
+    :type live: bool
+    :param live: Single-writer/multi-reader (SWMR) mode to monitor files
+        while they are being written. With mode ``"w"``, the file switches
+        to SWMR mode when the first time step is written and a time step
+        becomes visible to readers once it is complete, i.e. when the next
+        time step is started, with :meth:`flush`, or when closing the file.
+        Thus all variables must be defined before writing the first time
+        step. With mode ``"r"``, the file can be opened while it is still
+        being written (but only after the first time step has been written)
+        and :meth:`refresh` picks up newly written time steps.
+    :type lazy: bool
+    :param lazy: Return array-like proxies from :meth:`get_coords`,
+        :meth:`get_elem_connectivity` (without ``indices``),
+        :meth:`get_node_variable_values`, and
+        :meth:`get_element_variable_values` instead of reading all values.
+        They have a ``shape`` and a ``dtype``, only read the hyperslabs that
+        are indexed, and can be converted with :func:`numpy.asarray`. They
+        can only be read while the file is open. Memory mapped arrays
+        (``mmap=True``) are returned as usual as they are lazy anyways.
     """
 
     def __init__(
@@ -87,20 +589,64 @@ class exodus(object):
         numSideSets=None,
         io_size=0,
         compression=None,
+        compression_workers=0,
+        write_queue_size=0,
+        expected_steps=None,
+        chunk_layout=None,
+        int64=False,
+        mmap=False,
+        instrument=False,
+        live=False,
+        lazy=False,
+        gather_gap=_DEFAULT_GATHER_GAP,
     ):
-
-        if compression:
-            self._comp_opts = {
-                "chunks": True,
-                "compression": compression[0],
-                "compression_opts": compression[1],
-            }
-        else:
-            self._comp_opts = {}
+        # Set first so closing a half initialized object works.
+        self._writer = None
+        self._compression_pool = None
+        self._closed = True
+        self._stats = None
+
+        self._mode = mode
+        self._expected_steps = expected_steps
+        if isinstance(chunk_layout, dict):
+            for _l in chunk_layout.values():
+                _check_chunk_layout(_l)
+        elif chunk_layout is not None:
+            _check_chunk_layout(chunk_layout)
+        self._chunk_layout = chunk_layout
+
+        self._comp_opts = _compression_options(compression)
+        # Floating point results compress a lot better with the shuffle
+        # filter. Blosc shuffles internally. Numeric filter ids are used as
+        # given.
+        self._result_comp_opts = dict(self._comp_opts)
+        if (
+            compression
+            and isinstance(compression[0], str)
+            and not compression[0].startswith("blosc")
+        ):
+            self._result_comp_opts["shuffle"] = True
+
+        # Cache of the decoded names and name -> index lookup tables per
+        # name variable. Only invalidated by the methods changing the names.
+        self._name_cache = {}
+
+        assert not mmap or mode == "r", "mmap requires mode 'r'."
+        self._mmap = mmap
+        # Memory mapped array or None if not possible per dataset.
+        self._mmap_cache = {}
+        self._lazy = lazy
+        self._gather_gap = gather_gap
 
         # API is currently quite limited...mainly because nothing else is
         # implemented.
         assert mode in ["r", "a", "w"], "Only 'r', 'a', or 'w' is supported."
+        assert not live or mode != "a", "live requires mode 'r' or 'w'."
+        self._live = live
+        # Writing: If the file is in SWMR mode and the number of time steps
+        # visible to readers.
+        self._swmr = False
+        self._published = 0
         assert array_type == "numpy", "array_type must be 'numpy'."
 
         if mode == "w":
@@ -125,9 +671,22 @@ class exodus(object):
             else:  # pragma: no cover
                 raise NotImplementedError
 
+            if int64:
+                self._set_int64_status(_EX_ALL_INT64_DB)
+            else:
+                self._set_int64_status(0)
+                if max(numNodes, numElems) > np.iinfo(np.int32).max:
+                    raise ValueError(
+                        "More than 2^31 - 1 nodes or elements require "
+                        "int64=True."
+                    )
+
             assert not os.path.exists(file), "File '%s' already exists." % file
 
-            self._f = h5netcdf.File(file, mode="w")
+            # SWMR requires the latest file format.
+            kwargs = {"libver": "latest"} if live else {}
+            self._file = _import_h5netcdf().File(file, mode="w", **kwargs)
+            self._closed = False
 
             self._write_attrs(title=title)
 
@@ -153,21 +712,249 @@ class exodus(object):
         elif mode in ["r", "a"]:
             if mode == "r":
                 assert os.path.exists(file), "File '%s' does not exist." % file
-            self._f = h5netcdf.File(file, mode=mode)
-
-            # Currently no logic for this.
-            if self._f.dimensions["num_el_blk"] > 1:  # pragma: no cover
-                msg = (
-                    "The file has more than one element block. pyexodus "
-                    "currently contains no logic to deal with that. "
-                    "Proceed at your own risk and best contact the "
-                    "developers."
+            if _netcdf3.is_netcdf3(file):
+                assert mode == "r", "netCDF-3 files can only be read."
+                assert not live, "live requires an HDF5 based file."
+                self._file = _netcdf3.File(file)
+                # All variables are memory mapped anyways.
+                self._mmap = False
+            else:
+                _try_import_hdf5plugin()
+                kwargs = {"swmr": True} if live else {}
+                self._file = _import_h5netcdf().File(file, mode=mode, **kwargs)
+            self._closed = False
+
+            if "int64_status" in self._f.attrs:
+                self._set_int64_status(
+                    int(np.ravel(self._f.attrs["int64_status"])[0])
                 )
-                warnings.warn(msg)
+            else:  # pragma: no cover
+                self._set_int64_status(0)
 
         else:  # pragma: no cover
             raise NotImplementedError
 
+        if instrument:
+            # Imported here to not slow down importing pyexodus.
+            from . import _instrument
+
+            self._stats = _instrument.Stats(
+                callback=instrument if callable(instrument) else None
+            )
+            self._file = _instrument.InstrumentedFile(self._file, self._stats)
+            _instrument.instrument_methods(
+                self, self._stats, exclude=["stats"]
+            )
+            self._write_chunks_direct = _instrument.instrument_direct_chunk_writes(
+                self._write_chunks_direct, self._stats
+            )
+
+        # The time dependent variables might have more steps than actually
+        # written as they grow in bigger increments. Only the time values
+        # always have the number of written steps.
+        self._allocated_steps = max(
+            [
+                _v.shape[0]
+                for _v in self._f.variables.values()
+                if _v.dimensions[:1] == ("time_step",)
+            ]
+            or [0]
+        )
+        if "time_whole" in self._f.variables:
+            self._num_steps = self._f.variables["time_whole"].shape[0]
+        else:  # pragma: no cover
+            self._num_steps = self._allocated_steps
+
+        # In-memory catalogue of the small metadata variables (block and
+        # side set ids and status flags and the times) so they are only read
+        # once. Kept up to date by all methods writing to them.
+        self._catalogue = {}
+        # {id: 0-based index} lookup tables of the block and side set ids.
+        # The first occurrence wins, just like list.index().
+        self._catalogue_index = {}
+        self._build_catalogue()
+
+        # Most methods taking a block id use it as the position of the block
+        # in the file. Only get_side_set_node_list() deals with arbitrary
+        # block ids.
+        ids = [
+            _id
+            for _id, _s in zip(
+                self._catalogue["eb_prop1"], self._catalogue["eb_status"]
+            )
+            if _s
+        ]
+        if len(ids) > 1 and ids != list(range(1, len(ids) + 1)):
+            msg = (
+                "The element block ids of the file are not 1, 2, ... in "
+                "the order of the blocks. Methods taking a block id treat "
+                "it as the position of the block in the file. Proceed at "
+                "your own risk and best contact the developers."
+            )
+            warnings.warn(msg)
+
+        if compression_workers > 1:
+            # Imported here as it is slow to import.
+            import concurrent.futures
+
+            self._compression_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=compression_workers
+            )
+            self._compression_workers = compression_workers
+            # The shuffle flag and compression level per dataset or None if
+            # the dataset is not eligible for direct chunk writes.
+            self._direct_chunk_filters = {}
+
+        if write_queue_size > 0:
+            self._writer = _BackgroundWriter(maxsize=write_queue_size)
+
+    def _set_int64_status(self, status):
+        """
+        Set the integer types of the bulk data (connectivity and side sets)
+        and of the ids from the exodus int64 status bits.
+        """
+        self.__int64_status = status
+        if status & _EX_BULK_INT64_DB:
+            self.__bulk_dtype = np.int64
+        else:
+            self.__bulk_dtype = np.int32
+        if status & _EX_IDS_INT64_DB:
+            self.__id_dtype = np.int64
+        else:
+            self.__id_dtype = np.int32
+
+    def stats(self):
+        """
+        Get the statistics recorded if the file has been opened with
+        ``instrument=True``.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+
+        Returns a dictionary with three keys:
+
+        * ``"methods"``: The number of ``"calls"`` and the accumulated
+          ``"time"`` in seconds per public method.
+        * ``"datasets"``: The number of ``"reads"`` and ``"writes"``, the
+          ``"bytes_read"`` and ``"bytes_written"``, and the accumulated
+          ``"time"`` per variable in the file.
+        * ``"resizes"``: The ``"count"`` and accumulated ``"time"`` of the
+          resizes per dimension. The time values grow with every written
+          step - these resizes are listed as ``"time_whole"``.
+        """
+        if self._stats is None:
+            raise ValueError(
+                "Statistics are only recorded with instrument=True."
+            )
+        self._wait_for_writes()
+        return self._stats.as_dict()
+
+    def _build_catalogue(self):
+        """
+        Read all small metadata variables and names into memory.
+        """
+        for var_name in ["eb_prop1", "eb_status", "ss_prop1", "ss_status"]:
+            if var_name in self._f.variables:
+                values = self._f.variables[var_name][:].tolist()
+            else:
+                values = []
+            self._catalogue[var_name] = values
+        for var_name in ["eb_prop1", "ss_prop1"]:
+            lookup = {}
+            for _i, _id in enumerate(self._catalogue[var_name]):
+                lookup.setdefault(_id, _i)
+            self._catalogue_index[var_name] = lookup
+        if "time_whole" in self._f.variables:
+            self._catalogue["time_whole"] = self._f.variables["time_whole"][
+                : self._num_steps
+            ].tolist()
+        else:  # pragma: no cover
+            self._catalogue["time_whole"] = []
+        for var_name in ["name_glo_var", "name_nod_var", "name_elem_var"]:
+            if var_name in self._f.variables:
+                self._get_names(var_name)
+        if "ss_names" in self._f.variables:
+            self._get_names("ss_names")
+
+    def _set_catalogue_value(self, var_name, index, value):
+        """
+        Write a single value of a catalogued variable.
+
+        :type var_name: str
+        :param var_name: The name of the variable, e.g. ``"eb_prop1"``.
+        :type index: int
+        :param index: The 0-based index.
+        :param value: The value.
+        """
+        self._f.variables[var_name][index] = value
+        values = self._catalogue[var_name]
+        lookup = self._catalogue_index.get(var_name)
+        if lookup is not None:
+            old = values[index]
+            if lookup.get(old) == index:
+                # Point to the next occurrence of the old value, if any.
+                try:
+                    lookup[old] = values.index(old, index + 1)
+                except ValueError:
+                    del lookup[old]
+            if lookup.get(value, index) >= index:
+                lookup[value] = index
+        values[index] = value
+
+    def _get_catalogue_index(self, var_name, id):
+        """
+        Get the 0-based index of a block or side set id or None.
+
+        :type var_name: str
+        :param var_name: ``"eb_prop1"`` or ``"ss_prop1"``.
+        :type id: int
+        :param id: The id.
+        """
+        return self._catalogue_index[var_name].get(id)
+
+    def _update_times(self, start, values):
+        """
+        Update the catalogued times after they have been written.
+
+        :type start: int
+        :param start: The 0-based index of the first value.
+        :type values: :class:`numpy.ndarray`
+        :param values: The times as written to the file.
+        """
+        # Same precision as in the file.
+        values = np.asarray(
+            values, dtype=self._f.variables["time_whole"].dtype
+        ).ravel()
+        times = self._catalogue["time_whole"]
+        stop = start + len(values)
+        if stop > len(times):
+            times.extend([0.0] * (stop - len(times)))
+        times[start:stop] = values.tolist()
+
+    @property
+    def _f(self):
+        """
+        The underlying file.
+
+        Waits for all pending background writes unless called from the
+        background writer thread itself.
+        """
+        self._wait_for_writes()
+        return self._file
+
+    def _wait_for_writes(self):
+        """
+        Wait for all pending background writes.
+
+        Does nothing without a background writer or if called from the
+        background writer thread itself.
+        """
+        writer = self._writer
+        if writer is not None and not writer.in_writer_thread():
+            writer.join()
+
     @property
     def num_dims(self):
         """
@@ -223,9 +1010,18 @@ class exodus(object):
         :type zCoords: :class:`numpy.ndarray`
         :param zCoords:  The Z coordinates.
         """
-        self._f.variables["coordx"][:] = xCoords
-        self._f.variables["coordy"][:] = yCoords
-        self._f.variables["coordz"][:] = zCoords
+        num_nodes = self._f.dimensions["num_nodes"]
+        for var_name, values in [
+            ("coordx", xCoords),
+            ("coordy", yCoords),
+            ("coordz", zCoords),
+        ]:
+            if np.shape(values) == (num_nodes,):
+                self._write_rows(var_name, 0, values)
+            else:
+                # Let h5py broadcast scalars and complain about arrays with
+                # the wrong shape.
+                self._f.variables[var_name][:] = values
 
     def put_elem_blk_info(
         self, id, elemType, numElems, numNodesPerElem, numAttrsPerElem
@@ -252,9 +1048,9 @@ class exodus(object):
         # So the logic is as follows. `eb_status` keeps track of which
         # element ids have already been assigned. We find the first that is
         # not zero and that is the actual index of the the element block.
-        status = self._f._variables["eb_status"][:]
+        status = self._catalogue["eb_status"]
         assert 0 in status, "All element blocks already set."
-        idx = np.argwhere(status == 0)[0][0] + 1
+        idx = status.index(0) + 1
 
         num_el_name = "num_el_in_blk%i" % idx
         num_node_per_el_name = "num_nod_per_el%i" % idx
@@ -266,15 +1062,15 @@ class exodus(object):
         self._f.create_variable(
             var_name,
             (num_el_name, num_node_per_el_name),
-            dtype=np.int32,
+            dtype=self.__bulk_dtype,
             **self._comp_opts
         )
         self._f.variables[var_name].attrs["elem_type"] = np.string_(elemType)
 
         # Set the status and thus "claim" the element block id.
-        self._f.variables["eb_status"][idx - 1] = 1
+        self._set_catalogue_value("eb_status", idx - 1, 1)
         # For some reason this is always eb_prop1.
-        self._f.variables["eb_prop1"][idx - 1] = id
+        self._set_catalogue_value("eb_prop1", idx - 1, id)
 
     def put_elem_connectivity(
         self, id, connectivity, shift_indices=0, chunk_size_in_mb=128
@@ -290,7 +1086,9 @@ class exodus(object):
         :type connectivity: :class:`numpy.ndarray`
         :param connectivity: The connectivity. Must be equal to the number
             of of elements times the number of nodes per element for any
-            given block.
+            given block. Can also be a :class:`numpy.memmap` or any other
+            object supporting the buffer protocol - it is never copied as a
+            whole.
         :type shift_indices: int
         :param shift_indices: **Not available in the official exodus Python
             API!** This value will be added to all indices before they are
@@ -298,11 +1096,13 @@ class exodus(object):
             internally work with a 0-based indexing scheme but exodus
             requires a 1-based indexing scheme.
         :type chunk_size_in_mb: int
-        :param chunk_size_in_mb: If ``shift_indices`` != 0 values will be
-            written in chunks of this size. This is also the maximum memory
-            usage of this method. If ``shift_indices`` == 0, all indices
-            will be written directly from memory and no additional memory is
-            required.
+        :param chunk_size_in_mb: The connectivity is written in pieces of
+            roughly this size, aligned to the chunks of the dataset. If
+            ``shift_indices`` != 0 or the connectivity has to be converted to
+            the integer type of the file, a single buffer of this size is
+            used for all pieces. This is also the maximum memory usage of
+            this method. Otherwise all indices will be written directly from
+            memory and no additional memory is required.
         """
         num_el_name = "num_el_in_blk%i" % id
         num_node_per_el_name = "num_nod_per_el%i" % id
@@ -315,35 +1115,54 @@ class exodus(object):
             "Block id %i does not exist" % id
         )
 
+        connectivity = np.asarray(connectivity)
         assert connectivity.size == (
             self._f.dimensions[num_el_name]
             * self._f.dimensions[num_node_per_el_name]
         )
 
-        if shift_indices:
-            ne = self._f.dimensions[num_el_name]
-            nn = self._f.dimensions[num_node_per_el_name]
-
-            chunk_size = int(
-                chunk_size_in_mb * 1024 ** 2 / connectivity.dtype.itemsize / nn
-            )
-
-            _t = connectivity.reshape((ne, nn))
-
-            idx = 0
-            while idx < ne:
-                self._f.variables[var_name][idx : idx + chunk_size] = (  # NOQA
-                    _t[idx : idx + chunk_size] + shift_indices  # NOQA
-                )
-                idx += chunk_size
-        else:
-            self._f.variables[var_name][:] = connectivity.reshape(
-                (
-                    self._f.dimensions[num_el_name],
-                    self._f.dimensions[num_node_per_el_name],
-                )
-            )
-
+        ne = self._f.dimensions[num_el_name]
+        nn = self._f.dimensions[num_node_per_el_name]
+        _t = connectivity.reshape((ne, nn))
+        var = self._f.variables[var_name]
+        dtype = np.dtype(var.dtype)
+        convert = bool(shift_indices) or _t.dtype != dtype
+
+        chunk_size = int(
+            chunk_size_in_mb
+            * 1024 ** 2
+            / max(_t.dtype.itemsize, dtype.itemsize)
+            / nn
+        )
+        # Whole chunks of the dataset so nothing has to be read back.
+        chunk_rows = var._h5ds.chunks[0] if var._h5ds.chunks else 1
+        chunk_size = max(chunk_rows, chunk_size // chunk_rows * chunk_rows)
+        chunk_size = min(chunk_size, ne)
+
+        if convert:
+            # Reused for all pieces.
+            buf = np.empty((chunk_size, nn), dtype=dtype)
+            info = np.iinfo(dtype)
+
+        idx = 0
+        while idx < ne:
+            _c = _t[idx : idx + chunk_size]  # NOQA
+            if convert and _c.size:
+                if (
+                    int(_c.min()) + shift_indices < info.min
+                    or int(_c.max()) + shift_indices > info.max
+                ):
+                    raise ValueError(
+                        "Connectivity of block %i does not fit into %s. "
+                        "Create the file with int64=True." % (id, dtype.name)
+                    )
+                _b = buf[: len(_c)]
+                np.add(_c, shift_indices, out=_b, casting="unsafe")
+                _c = _b
+            self._write_rows(var_name, idx, _c)
+            idx += chunk_size
+
+    @_deferrable
     def put_time(self, step, value):
         """
         Put time step and value into exodus file.
@@ -353,8 +1172,23 @@ class exodus(object):
         :type value: float
         :param value: The actual time at that index.
         """
-        self.__resize_time_if_necessary(step)
+        if self._live:
+            self._put_time_block("time_whole", step, [value])
+            return
+        self._resize_time_if_necessary(step)
         self._f.variables["time_whole"][step - 1] = value
+        self._update_times(step - 1, [value])
+
+    def get_times(self):
+        """
+        Get all time values.
+
+        Answered from memory - the times are only read once when opening
+        the file.
+        """
+        # Accessing the file waits for pending background writes.
+        dtype = self._f.variables["time_whole"].dtype
+        return np.array(self._catalogue["time_whole"], dtype=dtype)
 
     def set_global_variable_number(self, number):
         """
@@ -365,8 +1199,10 @@ class exodus(object):
         """
         if not number:  # pragma: no cover
             return
+        self._assert_not_swmr()
 
         self._f.dimensions["num_glo_var"] = number
+        self._name_cache.pop("name_glo_var", None)
 
         self._f.create_variable(
             "name_glo_var",
@@ -374,12 +1210,7 @@ class exodus(object):
             dtype="|S1",
             **self._comp_opts
         )
-        self._f.create_variable(
-            "vals_glo_var",
-            ("time_step", "num_glo_var"),
-            dtype=self.__f_dtype,
-            **self._comp_opts
-        )
+        self._create_result_variable("vals_glo_var", "num_glo_var")
 
     def put_global_variable_name(self, name, index):
         """
@@ -394,7 +1225,9 @@ class exodus(object):
         self._f.variables["name_glo_var"][index - 1, : len(name)] = [
             _i.encode() if hasattr(_i, "encode") else _i for _i in name
         ]
+        self._name_cache.pop("name_glo_var", None)
 
+    @_deferrable
     def put_global_variable_value(self, name, step, value):
         """
         Put global variable value and variable name at time step into exodus
@@ -407,26 +1240,89 @@ class exodus(object):
         :type value: float
         :param value: The actual time at that index.
         """
-        self.__resize_time_if_necessary(step)
-        idx = self.get_global_variable_names().index(name)
+        self._resize_time_if_necessary(step)
+        idx = self._get_name_index("name_glo_var", name)
         self._f.variables["vals_glo_var"][step - 1, idx] = value
 
     def get_global_variable_names(self):
         """
         Get list of global variable names in exodus file.
         """
-        return [
-            b"".join(_i).strip().decode()
-            for _i in self._f.variables["name_glo_var"][:]
-        ]
+        return list(self._get_names("name_glo_var"))
 
     def get_global_variable_values(self, name):
         """
         Get global variables values within an exodus file.
         """
-        idx = self.get_global_variable_names().index(name)
+        idx = self._get_name_index("name_glo_var", name)
         return self._f.variables["vals_glo_var"][0, idx]
 
+    def get_global_variable_history(self, names, steps=None):
+        """
+        Get the values of one or more global variables for many time steps.
+
+        All values are read with a single read from the file.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+
+        :type names: str or list of str
+        :param names: The name of a global variable or a list of names.
+        :type steps: int or tuple
+        :param steps: The time steps to read. Either a single step, a tuple
+            of the first and last step (both 1-based and inclusive), or
+            ``None`` for all steps.
+
+        Returns an array with shape ``(n_steps,)`` if a single name is given,
+        otherwise with shape ``(n_steps, n_names)``.
+        """
+        single = isinstance(names, str)
+        if single:
+            names = [names]
+        idx = [self._get_name_index("name_glo_var", _i) for _i in names]
+
+        start, stop = self._step_range("vals_glo_var", steps)
+        var = self._f.variables["vals_glo_var"]
+        if not idx:
+            return np.empty((stop - start, 0), dtype=var.dtype)
+        # One hyperslab covering all requested variables.
+        first = min(idx)
+        values = var[start:stop, first : max(idx) + 1]  # NOQA
+        values = values[:, [_i - first for _i in idx]]
+        if single:
+            return values[:, 0]
+        return values
+
+    def _step_range(self, var_name, steps):
+        """
+        Convert the steps argument of the history methods to a range of
+        0-based indices.
+
+        :type var_name: str
+        :param var_name: The name of the time dependent variable.
+        :type steps: int or tuple
+        :param steps: A single step, a tuple of the first and last step
+            (1-based and inclusive), or ``None`` for all steps.
+        """
+        available_steps = self._f.variables[var_name].shape[0]
+        # Might be larger than the number of written steps.
+        if self._f.dimensions["time_step"] is None:
+            available_steps = min(available_steps, self._num_steps)
+
+        if steps is None:
+            return 0, available_steps
+        if isinstance(steps, tuple):
+            first, last = steps
+        else:
+            first = last = steps
+        if not (0 < first <= last <= available_steps):
+            raise ValueError(
+                "Steps must be 0 < first <= last <= %i." % available_steps
+            )
+        return first - 1, last
+
     def set_element_variable_number(self, number):
         """
         Set number of element variables in exodus file.
@@ -436,8 +1332,10 @@ class exodus(object):
         """
         if not number:
             return
+        self._assert_not_swmr()
 
         self._f.dimensions["num_elem_var"] = number
+        self._name_cache.pop("name_elem_var", None)
 
         self._f.create_variable(
             "name_elem_var",
@@ -459,16 +1357,15 @@ class exodus(object):
         self._f.variables["name_elem_var"][index - 1, : len(name)] = [
             _i.encode() if hasattr(_i, "encode") else _i for _i in name
         ]
+        self._name_cache.pop("name_elem_var", None)
 
     def get_element_variable_names(self):
         """
         Get list of element variable names in exodus file.
         """
-        return [
-            b"".join(_i).strip().decode()
-            for _i in self._f.variables["name_elem_var"][:]
-        ]
+        return list(self._get_names("name_elem_var"))
 
+    @_deferrable
     def put_element_variable_values(self, blockId, name, step, values):
         """
         Put values into element block id and variable name at step.
@@ -482,30 +1379,110 @@ class exodus(object):
         :type values: :class:`numpy.ndarray`
         :param values: The actual values.
         """
-        self.__resize_time_if_necessary(step)
+        self._resize_time_if_necessary(step)
+        variable_name = self._require_element_variable(blockId, name)
+        self._write_row(variable_name, step - 1, values)
 
+    def _require_element_variable(self, blockId, name, chunk_steps=None):
+        """
+        Get the name of the dataset of an element variable in a block.
+
+        The dataset is created if it does not yet exist.
+
+        :type blockId: int
+        :param blockId: The block id.
+        :type name: str
+        :param name: The name of the variable.
+        :type chunk_steps: int
+        :param chunk_steps: The number of time steps per chunk in case the
+            dataset has to be created. Uses the default chunking if not
+            given.
+        """
         num_elem_name = "num_el_in_blk%i" % blockId
         assert num_elem_name in self._f.dimensions, (
             "Block id %i not found." % blockId
         )
 
         # 1-based indexing!
-        idx = self.get_element_variable_names().index(name) + 1
+        idx = self._get_name_index("name_elem_var", name) + 1
 
         variable_name = "vals_elem_var%ieb%i" % (idx, blockId)
 
         # If it does not exist, create it.
         if variable_name not in self._f.variables:
-            self._f.create_variable(
-                variable_name,
-                ("time_step", num_elem_name),
-                dtype=self.__f_dtype,
-                **self._comp_opts
+            self._create_result_variable(
+                variable_name, num_elem_name, chunk_steps=chunk_steps
+            )
+
+        return variable_name
+
+    def _create_result_variable(self, name, dim_name, chunk_steps=None):
+        """
+        Create a floating point variable over time and another dimension.
+
+        :type name: str
+        :param name: The name of the variable.
+        :type dim_name: str
+        :param dim_name: The name of the second dimension.
+        :type chunk_steps: int
+        :param chunk_steps: The number of time steps per chunk.
+        """
+        opts = dict(self._result_comp_opts)
+        chunks = self._time_chunks(
+            self._f.dimensions[dim_name], chunk_steps, name=name
+        )
+        if chunks is not None:
+            opts["chunks"] = chunks
+        self._f.create_variable(
+            name, ("time_step", dim_name), dtype=self.__f_dtype, **opts
+        )
+
+    def _time_chunks(self, num_columns=None, chunk_steps=None, name=None):
+        """
+        Get the chunk shape of a time dependent variable.
+
+        Returns ``None`` if the default chunking should be used.
+
+        :type num_columns: int
+        :param num_columns: The size of the second dimension. ``None`` for
+            one dimensional variables.
+        :type chunk_steps: int
+        :param chunk_steps: The number of time steps per chunk. Derived from
+            the chunk layout or the expected number of steps if not given.
+        :type name: str
+        :param name: The name of the variable to look up its chunk layout.
+        """
+        itemsize = np.dtype(self.__f_dtype).itemsize
+        if isinstance(self._chunk_layout, dict):
+            layout = self._chunk_layout.get(name)
+        else:
+            layout = self._chunk_layout
+        if chunk_steps is None and layout and num_columns is not None:
+            return _plan_chunks(
+                layout,
+                self._expected_steps or _DEFAULT_EXPECTED_STEPS,
+                num_columns,
+                itemsize,
             )
 
-        self._f.variables[variable_name][step - 1] = values
+        if chunk_steps is None:
+            if not self._expected_steps:
+                return None
+            # The chunks should still cover a reasonable number of columns.
+            chunk_steps = max(
+                1,
+                min(
+                    self._expected_steps,
+                    _TARGET_CHUNK_BYTES // (itemsize * (num_columns or 1)),
+                ),
+            )
+        if num_columns is None:
+            return (chunk_steps,)
+        # Limit the size of the chunks.
+        columns = _TARGET_CHUNK_BYTES // (chunk_steps * itemsize)
+        return (chunk_steps, max(1, min(num_columns, columns)))
 
-    def get_element_variable_values(self, blockId, name, step):
+    def get_element_variable_values(self, blockId, name, step, out=None):
         """
         Get values from element block id and variable name at step.
 
@@ -515,6 +1492,12 @@ class exodus(object):
         :param name: The name of the variable.
         :type step: int
         :param step: The time step at which to put the values.
+        :type out: :class:`numpy.ndarray`
+        :param out: Read the values into this array instead of allocating a
+            new one. Must be C-contiguous and have the correct shape. The
+            values are converted to its dtype while reading, e.g. from
+            double to single precision. This parameter is not part of the
+            official exodus Python API.
         Return values: The actual values.
         """
         assert step > 0, "Step must be larger than 0."
@@ -523,13 +1506,105 @@ class exodus(object):
             or step <= self._f.dimensions["time_step"]
         )
 
+        variable_name = self._get_element_variable_name(blockId, name)
+        # If it is resizeable, check the actual size.
+        if self._f.dimensions["time_step"] is None:
+            available_steps = min(
+                self._f.variables[variable_name].shape[0], self._num_steps
+            )
+            if not (0 < step <= available_steps):
+                msg = "Step must be 0 < step <= %i." % available_steps
+                raise ValueError(msg)
+
+        return self._read(variable_name, row=step - 1, out=out)
+
+    def get_element_variable_history(
+        self, blockId, name, elem_ids, steps=None
+    ):
+        """
+        Get the values of an element variable of some elements in a block
+        for many time steps.
+
+        Only the requested elements are read from the file.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+
+        :type blockId: int
+        :param blockId: The block id.
+        :type name: str
+        :param name: The name of the variable.
+        :type elem_ids: list of int
+        :param elem_ids: The 1-based element ids within the block.
+        :type steps: int or tuple
+        :param steps: The time steps to read. Either a single step, a tuple
+            of the first and last step (both 1-based and inclusive), or
+            ``None`` for all steps.
+
+        Returns an array with shape ``(n_steps, n_elems)``.
+        """
+        variable_name = self._get_element_variable_name(blockId, name)
+        start, stop = self._step_range(variable_name, steps)
+        return self._read_columns(variable_name, start, stop, elem_ids)
+
+    def iter_element_variable_values(
+        self,
+        blockId,
+        name,
+        steps=None,
+        elem_chunk=None,
+        memory_budget=_DEFAULT_MEMORY_BUDGET,
+    ):
+        """
+        Iterate over the values of an element variable in a block in blocks
+        of time steps and elements.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+
+        Works like :meth:`iter_node_variable_values`.
+
+        :type blockId: int
+        :param blockId: The block id.
+        :type name: str
+        :param name: The name of the variable.
+        :type steps: int or tuple
+        :param steps: The time steps to iterate over. Either a single step,
+            a tuple of the first and last step (both 1-based and inclusive),
+            or ``None`` for all steps.
+        :type elem_chunk: int
+        :param elem_chunk: The number of elements per block. Rounded down to
+            a multiple of the chunk shape if larger than it. Whole steps if
+            possible and if not given.
+        :type memory_budget: int
+        :param memory_budget: The largest size of a block in bytes.
+        """
+        variable_name = self._get_element_variable_name(blockId, name)
+        return self._iter_time_blocks(
+            variable_name, steps, elem_chunk, memory_budget
+        )
+
+    def _get_element_variable_name(self, blockId, name):
+        """
+        Get the name of the existing dataset of an element variable in a
+        block.
+
+        :type blockId: int
+        :param blockId: The block id.
+        :type name: str
+        :param name: The name of the variable.
+        """
         num_elem_name = "num_el_in_blk%i" % blockId
         assert num_elem_name in self._f.dimensions, (
             "Block id %i not found." % blockId
         )
 
         # 1-based indexing!
-        idx = self.get_element_variable_names().index(name) + 1
+        idx = self._get_name_index("name_elem_var", name) + 1
 
         variable_name = "vals_elem_var%ieb%i" % (idx, blockId)
 
@@ -537,8 +1612,120 @@ class exodus(object):
         assert variable_name in self._f.variables, (
             "Variable %s not found" % variable_name
         )
-
-        return self._f.variables[variable_name][step - 1][:]
+        return variable_name
+
+    def _iter_time_blocks(self, var_name, steps, columns, memory_budget):
+        """
+        Iterate over blocks of a time dependent variable.
+
+        The blocks are aligned to the chunks of the dataset so every chunk
+        is only read once and as few chunks as possible are read at the
+        same time.
+
+        :type var_name: str
+        :param var_name: The name of the variable.
+        :type steps: int or tuple
+        :param steps: The time steps, see :meth:`_step_range`.
+        :type columns: int
+        :param columns: The requested number of columns per block.
+        :type memory_budget: int
+        :param memory_budget: The largest size of a block in bytes.
+        """
+        var = self._f.variables[var_name]
+        start, stop = self._step_range(var_name, steps)
+        num_columns = var.shape[1]
+        chunks = getattr(var, "chunks", None) or (1, num_columns)
+        budget = max(1, memory_budget // var.dtype.itemsize)
+
+        if columns is None:
+            # Prefer whole rows. At least one chunk of steps has to fit.
+            columns = budget // max(1, min(chunks[0], stop - start))
+        columns = _aligned_block(num_columns, chunks[1], columns)
+        rows = _aligned_block(stop, chunks[0], budget // columns)
+
+        # Generator so the arguments are checked right away.
+        def _iterate():
+            _s = start
+            while _s < stop:
+                # Blocks end at multiples of the block length.
+                _e = min(stop, (_s // rows + 1) * rows)
+                for _c in range(0, num_columns, columns):
+                    _ce = min(num_columns, _c + columns)
+                    yield (
+                        range(_s + 1, _e + 1),
+                        range(_c + 1, _ce + 1),
+                        self._f.variables[var_name][_s:_e, _c:_ce],
+                    )
+                _s = _e
+
+        return _iterate()
+
+    def _read_columns(self, var_name, start, stop, ids):
+        """
+        Read some columns of a time dependent variable.
+
+        The ids are sorted and coalesced into runs of consecutive columns so
+        only the requested data is read. The result has the order of the
+        passed ids.
+
+        :type var_name: str
+        :param var_name: The name of the variable.
+        :type start: int
+        :param start: The first step to read. 0-based.
+        :type stop: int
+        :param stop: The step to stop reading at. Exclusive.
+        :type ids: list of int
+        :param ids: The 1-based column ids.
+        """
+        var = self._f.variables[var_name]
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        unique, inverse = np.unique(ids, return_inverse=True)
+        if unique.size and not (0 < unique[0] and unique[-1] <= var.shape[1]):
+            raise ValueError("Ids must be 0 < id <= %i." % var.shape[1])
+
+        values = np.empty((stop - start, unique.size), dtype=var.dtype)
+        col = 0
+        for _s, _e in _contiguous_runs(unique - 1):
+            values[:, col : col + _e - _s] = var[start:stop, _s:_e]  # NOQA
+            col += _e - _s
+        return values[:, inverse]
+
+    def _read_rows(self, var_name, ids, plan=None):
+        """
+        Read some rows of a variable.
+
+        The ids are sorted and coalesced into runs of rows (see
+        :func:`_plan_gather`) so mostly only the requested rows are read
+        with few reads. The result has the order of the passed ids.
+
+        :type var_name: str
+        :param var_name: The name of the variable.
+        :type ids: list of int
+        :param ids: The 1-based row ids.
+        :type plan: tuple
+        :param plan: The result of :meth:`_plan_rows` to reuse it for
+            variables with the same shape.
+        """
+        var = self._variable(var_name)
+        if plan is None:
+            plan = self._plan_rows(var_name, ids)
+        runs, positions = plan
+
+        num_rows = sum(_e - _s for _s, _e in runs)
+        values = np.empty((num_rows,) + var.shape[1:], dtype=var.dtype)
+        row = 0
+        for _s, _e in runs:
+            values[row : row + _e - _s] = var[_s:_e]  # NOQA
+            row += _e - _s
+        return values[positions]
+
+    def _plan_rows(self, var_name, ids):
+        """
+        Plan reading some rows of a variable with :func:`_plan_gather`.
+        """
+        var = self._f.variables[var_name]
+        row_bytes = var.dtype.itemsize * int(np.prod(var.shape[1:]))
+        return _plan_gather(ids, var.shape[0], row_bytes, self._gather_gap)
 
     def set_node_variable_number(self, number):
         """
@@ -549,8 +1736,10 @@ class exodus(object):
         """
         if number == 0:  # pragma: no cover
             return
+        self._assert_not_swmr()
 
         self._f.dimensions["num_nod_var"] = number
+        self._name_cache.pop("name_nod_var", None)
 
         self._f.create_variable(
             "name_nod_var",
@@ -560,12 +1749,8 @@ class exodus(object):
         )
 
         for _i in range(number):
-            name = "vals_nod_var%i" % (_i + 1)
-            self._f.create_variable(
-                name,
-                ("time_step", "num_nodes"),
-                dtype=self.__f_dtype,
-                **self._comp_opts
+            self._create_result_variable(
+                "vals_nod_var%i" % (_i + 1), "num_nodes"
             )
 
     def put_node_variable_name(self, name, index):
@@ -584,15 +1769,13 @@ class exodus(object):
         self._f.variables["name_nod_var"][index - 1, : len(name)] = [
             _i.encode() if hasattr(_i, "encode") else _i for _i in name
         ]
+        self._name_cache.pop("name_nod_var", None)
 
     def get_node_variable_names(self):
         """
         Get list of node variable names in exodus file.
         """
-        return [
-            b"".join(_i).strip().decode()
-            for _i in self._f.variables["name_nod_var"][:]
-        ]
+        return list(self._get_names("name_nod_var"))
 
     def get_node_variable_number(self):
         """
@@ -602,15 +1785,210 @@ class exodus(object):
             return 0
         return int(self._f.dimensions["num_nod_var"])
 
-    def __resize_time_if_necessary(self, step):
+    def _get_names(self, var_name):
+        """
+        Get the decoded names stored in a character variable.
+
+        The names are cached so repeated lookups do not touch the file.
+
+        :type var_name: str
+        :param var_name: The name of the character variable, e.g.
+            ``"name_nod_var"``.
+        """
+        if var_name not in self._name_cache:
+            if var_name == "ss_names":
+                # Side set names are not stripped for historical reasons.
+                names = [
+                    "".join(
+                        _j.decode() if hasattr(_j, "decode") else _j
+                        for _j in _i
+                    )
+                    for _i in self._f.variables[var_name][:]
+                ]
+            else:
+                names = [
+                    b"".join(_i).strip().decode()
+                    for _i in self._f.variables[var_name][:]
+                ]
+            # The first occurrence wins, just like list.index().
+            lookup = {}
+            for _i, _name in enumerate(names):
+                lookup.setdefault(_name, _i)
+            self._name_cache[var_name] = (names, lookup)
+        return self._name_cache[var_name][0]
+
+    def _get_name_index(self, var_name, name):
+        """
+        Get the 0-based index of a name in a character variable.
+
+        Raises a ``ValueError`` if the name cannot be found.
+
+        :type var_name: str
+        :param var_name: The name of the character variable, e.g.
+            ``"name_nod_var"``.
+        :type name: str
+        :param name: The name to look up.
+        """
+        self._get_names(var_name)
+        try:
+            return self._name_cache[var_name][1][name]
+        except KeyError:
+            raise ValueError("%r is not in list" % name)
+
+    def _resize_time_if_necessary(self, step):
         assert step > 0, "Step must be larger than 0."
         assert (
             self._f.dimensions["time_step"] is None
             or step <= self._f.dimensions["time_step"]
         )
-        if step > self._f._current_dim_sizes["time_step"]:
-            self._f.resize_dimension("time_step", step)
+        if self._live and not self._swmr:
+            self._start_swmr()
+        new_steps = step > self._num_steps
+        if new_steps:
+            self._num_steps = step
+        allocated = self._allocated_steps
+        if step > allocated:
+            # Grow geometrically so the number of resizes only grows
+            # logarithmically with the number of steps. The surplus is
+            # trimmed when closing the file.
+            size = max(step, 2 * allocated, self._expected_steps or 0)
+            self._allocated_steps = size
+            if self._swmr:
+                # The time values are only resized when publishing steps.
+                self._resize_time_axis(self._live_variables, size)
+                return
+            self._f.resize_dimension("time_step", size)
+            new_steps = True
+        if new_steps and not self._live:
+            # Readers determine the number of steps from the time values so
+            # they never grow beyond the written steps. Otherwise the
+            # reserved steps would show up if the file is not closed.
+            self._resize_time_axis(["time_whole"], self._num_steps)
+
+    def _resize_time_axis(self, var_names, size):
+        """
+        Resize the time axis of some variables.
+
+        ``resize_dimension()`` cannot be used as it resizes all variables
+        with the dimension, including the time values. Resizes of only the
+        time values are recorded as ``"time_whole"`` and not as
+        ``"time_step"`` in the statistics.
+        """
+        start = time.perf_counter()
+        for var_name in var_names:
+            self._f.variables[var_name]._h5ds.resize(size, axis=0)
+        if self._stats is not None:
+            self._stats.record_resize(
+                "time_whole" if var_names == ["time_whole"] else "time_step",
+                size,
+                time.perf_counter() - start,
+            )
+
+    def _assert_not_swmr(self):
+        """
+        Make sure no datasets have to be created in a file in SWMR mode.
+        """
+        # Pending background writes might switch the file to SWMR mode.
+        self._wait_for_writes()
+        assert not self._swmr, (
+            "No variables can be added to live files once time steps have "
+            "been written."
+        )
+
+    def _start_swmr(self):
+        """
+        Switch a file opened with ``live=True`` to SWMR mode.
+
+        No datasets can be created afterwards so the ones of all element
+        variables in all blocks are created now.
+        """
+        if "num_elem_var" in self._f.dimensions:
+            for blk in range(1, self._f.dimensions["num_el_blk"] + 1):
+                num_elem_name = "num_el_in_blk%i" % blk
+                if num_elem_name not in self._f.dimensions:
+                    continue
+                for _i in range(self._f.dimensions["num_elem_var"]):
+                    variable_name = "vals_elem_var%ieb%i" % (_i + 1, blk)
+                    if variable_name not in self._f.variables:
+                        self._create_result_variable(
+                            variable_name, num_elem_name
+                        )
+        # Write everything h5netcdf keeps in memory.
+        self._f.flush()
+        self._f._h5file.swmr_mode = True
+        self._swmr = True
+        self._live_variables = [
+            _name
+            for _name, _v in self._f.variables.items()
+            if _v.dimensions[:1] == ("time_step",) and _name != "time_whole"
+        ]
+
+    def _publish(self, num_steps):
+        """
+        Make the first ``num_steps`` time steps of a live file visible to
+        readers.
+
+        All values are flushed before the time values are extended and
+        flushed, so readers never see steps that are not yet complete.
+        """
+        num_steps = min(num_steps, self._num_steps)
+        if not self._swmr or num_steps <= self._published:
+            return
+        h5file = self._f._h5file
+        h5file.flush()
+
+        var = self._f.variables["time_whole"]
+        times = np.zeros(num_steps - self._published, dtype=var.dtype)
+        _t = self._catalogue["time_whole"][self._published : num_steps]
+        times[: len(_t)] = _t
+        self._resize_time_axis(["time_whole"], num_steps)
+        var[self._published : num_steps] = times  # NOQA
+        h5file.flush()
+        self._published = num_steps
+
+    def flush(self):
+        """
+        Make all time steps written so far visible to readers of a file
+        opened with ``live=True``. Does nothing for other files.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+        """
+        self._wait_for_writes()
+        self._publish(self._num_steps)
+
+    def refresh(self):
+        """
+        Pick up the time steps written since opening a file with
+        ``live=True`` and mode ``"r"`` or the last call to this method.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+
+        The extents of all time dependent variables are read again as
+        HDF5 only updates them on request. The newly written times are read
+        into the in-memory catalogue. Returns the number of time steps.
+        """
+        assert (
+            self._live and self._mode == "r"
+        ), "refresh requires live=True and mode 'r'."
+        for _v in self._f.variables.values():
+            if _v.dimensions[:1] == ("time_step",):
+                _v._h5ds.refresh()
+        var = self._f.variables["time_whole"]
+        num_steps = var.shape[0]
+        if num_steps > self._num_steps:
+            self._update_times(
+                self._num_steps, var[self._num_steps : num_steps]  # NOQA
+            )
+        self._num_steps = num_steps
+        return num_steps
 
+    @_deferrable
     def put_node_variable_values(self, name, step, values):
         """
         Put node values into variable name at step into exodus file
@@ -622,15 +2000,237 @@ class exodus(object):
         :type values: :class:`numpy.ndarray`
         :param values: The actual values.
         """
-        self.__resize_time_if_necessary(step)
+        self._resize_time_if_necessary(step)
 
         # 1-based indexing!
-        idx = self.get_node_variable_names().index(name) + 1
+        idx = self._get_name_index("name_nod_var", name) + 1
 
         d_name = "vals_nod_var%i" % idx
-        self._f.variables[d_name][step - 1] = values
+        self._write_row(d_name, step - 1, values)
+
+    @_deferrable
+    def put_node_variable_values_batch(self, name, start_step, values):
+        """
+        Put node values for multiple consecutive time steps into the exodus
+        file.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+
+        The time dimension is resized only once and each variable is
+        written with a single call which is much faster than calling
+        :meth:`put_node_variable_values` for every step.
+
+        :type name: str or list of str
+        :param name: The name of the variable or a list of names to write
+            multiple variables at once.
+        :type start_step: int
+        :param start_step: The time step of the first row of values. First
+            is 1.
+        :type values: :class:`numpy.ndarray` or list of
+            :class:`numpy.ndarray`
+        :param values: The values with shape ``(n_steps, num_nodes)``. If
+            ``name`` is a list, this must be a list of such arrays (or a
+            single array of shape ``(n_names, n_steps, num_nodes)``).
+        """
+        assert start_step > 0, "Step must be larger than 0."
+
+        if isinstance(name, str):
+            names = [name]
+            values = [values]
+        else:
+            names = list(name)
+            assert len(names) == len(
+                values
+            ), "Must pass the same number of names and value arrays."
+
+        values = [np.asarray(_i) for _i in values]
+        num_nodes = self._f.dimensions["num_nodes"]
+        n_steps = values[0].shape[0] if values else 0
+        shape = (n_steps, num_nodes)
+        for _v in values:
+            assert _v.shape == shape, (
+                "Values must have shape (%i, %i)." % shape
+            )
+        if not n_steps:
+            return
+
+        # Resize once for all steps and variables.
+        self._resize_time_if_necessary(start_step + n_steps - 1)
+
+        # 1-based indexing!
+        for _name, _v in zip(names, values):
+            d_name = "vals_nod_var%i" % (
+                self._get_name_index("name_nod_var", _name) + 1
+            )
+            self._put_time_block(d_name, start_step, _v)
+
+    def _put_time_block(self, var_name, start_step, values):
+        """
+        Write values for consecutive time steps with a single write.
+
+        :type var_name: str
+        :param var_name: The name of the time dependent variable.
+        :type start_step: int
+        :param start_step: The time step of the first row. First is 1.
+        :type values: :class:`numpy.ndarray`
+        :param values: The values. The first axis is the time axis.
+        """
+        self._resize_time_if_necessary(start_step + len(values) - 1)
+        if self._live and var_name == "time_whole":
+            # Only written when the steps are published. Previously
+            # published steps are updated right away.
+            self._update_times(start_step - 1, values)
+            stop = min(self._published, start_step - 1 + len(values))
+            if stop >= start_step:
+                self._f.variables["time_whole"][
+                    start_step - 1 : stop  # NOQA
+                ] = values[: stop - start_step + 1]
+            self._publish(start_step - 1)
+            return
+        self._write_rows(var_name, start_step - 1, values)
+        if var_name == "time_whole":
+            self._update_times(start_step - 1, values)
+
+    def _write_rows(self, var_name, start, values):
+        """
+        Write values to consecutive rows of a variable.
+
+        Uses parallel compression and direct chunk writes if enabled and
+        possible.
+
+        :type var_name: str
+        :param var_name: The name of the variable.
+        :type start: int
+        :param start: The first row to write to. 0-based.
+        :type values: :class:`numpy.ndarray`
+        :param values: The values. Rows are along the first axis.
+        """
+        var = self._f.variables[var_name]
+        if self._compression_pool is not None:
+            values = np.asarray(values)
+            if self._write_chunks_direct(var_name, var._h5ds, start, values):
+                return
+        var[start : start + len(values)] = values  # NOQA
+
+    def _write_row(self, var_name, row, values):
+        """
+        Write a single row of a variable.
+
+        :type var_name: str
+        :param var_name: The name of the variable.
+        :type row: int
+        :param row: The row to write to. 0-based.
+        :type values: :class:`numpy.ndarray`
+        :param values: The values.
+        """
+        if self._compression_pool is not None:
+            values = np.asarray(values)
+            if values.shape == self._f.variables[var_name].shape[1:]:
+                self._write_rows(var_name, row, values[np.newaxis])
+                return
+        self._f.variables[var_name][row] = values
+
+    def _write_chunks_direct(self, var_name, h5ds, start, values):
+        """
+        Compress whole chunks in parallel and write them directly.
+
+        Returns ``False`` if that is not possible for this write, e.g.
+        because it does not cover whole chunks.
+        """
+        if var_name not in self._direct_chunk_filters:
+            self._direct_chunk_filters[var_name] = _deflate_filters(h5ds)
+        filters = self._direct_chunk_filters[var_name]
+        if filters is None:
+            return False
+        shuffle, level = filters
+
+        chunks = h5ds.chunks
+        shape = h5ds.shape
+        stop = start + values.shape[0]
+        # Must start at a chunk boundary and end at one or at the end of
+        # the dataset. Trailing dimensions must be written completely.
+        if (
+            values.ndim != len(shape)
+            or values.shape[1:] != shape[1:]
+            or start % chunks[0]
+            or (stop % chunks[0] and stop != shape[0])
+            or not values.size
+        ):
+            return False
+
+        values = np.ascontiguousarray(values, dtype=h5ds.dtype)
+        origin = (start,) + (0,) * (len(shape) - 1)
+
+        def _compress(offset):
+            block = values[
+                tuple(
+                    slice(_o - _b, _o - _b + _c)
+                    for _o, _b, _c in zip(offset, origin, chunks)
+                )
+            ]
+            # Edge chunks are always stored with the full chunk shape.
+            if block.shape != chunks:
+                padded = np.zeros(chunks, dtype=values.dtype)
+                padded[tuple(slice(0, _i) for _i in block.shape)] = block
+                block = padded
+            block = np.ascontiguousarray(block)
+            if shuffle:
+                # Same as HDF5's shuffle filter: First all first bytes of
+                # each value, then all second bytes, and so on.
+                block = (
+                    block.view(np.uint8).reshape((-1, block.dtype.itemsize)).T
+                )
+            return offset, zlib.compress(block.tobytes(), level)
+
+        offsets = itertools.product(
+            range(start, stop, chunks[0]),
+            *[range(0, _n, _c) for _n, _c in zip(shape[1:], chunks[1:])]
+        )
+        # Compress a limited number of chunks at a time to bound the memory
+        # usage.
+        batch_size = 4 * self._compression_workers
+        while True:
+            batch = list(itertools.islice(offsets, batch_size))
+            if not batch:
+                break
+            for offset, data in self._compression_pool.map(_compress, batch):
+                h5ds.id.write_direct_chunk(offset, data)
+        return True
+
+    def timestep_writer(self, buffer_steps=16):
+        """
+        Get a writer that buffers time steps in memory.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+
+        The returned object has the same ``put_time()``,
+        ``put_node_variable_values()``, ``put_element_variable_values()``,
+        and ``put_global_variable_value()`` methods as this class. Values are
+        collected for ``buffer_steps`` consecutive time steps and then
+        written with one write per dataset. Use it as a context manager to
+        make sure everything is flushed at the end:
+
+        >>> with e.timestep_writer(buffer_steps=32) as w:  # doctest: +SKIP
+        ...     for step in range(1, 101):
+        ...         w.put_time(step, step * 0.1)
+        ...         w.put_node_variable_values("u", step, u)
 
-    def get_node_variable_values(self, name, step):
+        Element variable datasets created by the writer get chunks spanning
+        ``buffer_steps`` time steps.
+
+        :type buffer_steps: int
+        :param buffer_steps: The number of time steps to keep in memory
+            before writing them to the file.
+        """
+        return _TimestepWriter(self, buffer_steps=buffer_steps)
+
+    def get_node_variable_values(self, name, step, out=None):
         """
         Get the node variable values for a a certain step.
 
@@ -638,6 +2238,12 @@ class exodus(object):
         :param name: The name of the variable.
         :type step: int
         :param step: The time step at which to get the values.
+        :type out: :class:`numpy.ndarray`
+        :param out: Read the values into this array instead of allocating a
+            new one. Must be C-contiguous and have the correct shape. The
+            values are converted to its dtype while reading, e.g. from
+            double to single precision. This parameter is not part of the
+            official exodus Python API.
         """
         # Make sure the step is valid.
         if step <= 0:
@@ -656,17 +2262,94 @@ class exodus(object):
             raise ValueError(msg)
         # Will raise with a reasonable error message if name is not correct.
         # 1-based indexing!
-        idx = self.get_node_variable_names().index(name) + 1
+        idx = self._get_name_index("name_nod_var", name) + 1
 
         d_name = "vals_nod_var%i" % idx
         # If it is resizeable, check the actual size.
         if self._f.dimensions["time_step"] is None:
-            available_steps = self._f.variables[d_name].shape[0]
+            available_steps = min(
+                self._f.variables[d_name].shape[0], self._num_steps
+            )
             if not (0 < step <= available_steps):
                 msg = "Step must be 0 < step <= %i." % available_steps
                 raise ValueError(msg)
 
-        return self._f.variables[d_name][step - 1][:]
+        return self._read(d_name, row=step - 1, out=out)
+
+    def get_node_variable_history(self, name, node_ids, steps=None):
+        """
+        Get the values of a node variable at some nodes for many time steps.
+
+        Only the requested nodes are read from the file.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+
+        :type name: str
+        :param name: The name of the variable.
+        :type node_ids: list of int
+        :param node_ids: The 1-based node ids.
+        :type steps: int or tuple
+        :param steps: The time steps to read. Either a single step, a tuple
+            of the first and last step (both 1-based and inclusive), or
+            ``None`` for all steps.
+
+        Returns an array with shape ``(n_steps, n_nodes)``.
+        """
+        # 1-based indexing!
+        idx = self._get_name_index("name_nod_var", name) + 1
+        d_name = "vals_nod_var%i" % idx
+
+        start, stop = self._step_range(d_name, steps)
+        return self._read_columns(d_name, start, stop, node_ids)
+
+    def iter_node_variable_values(
+        self,
+        name,
+        steps=None,
+        node_chunk=None,
+        memory_budget=_DEFAULT_MEMORY_BUDGET,
+    ):
+        """
+        Iterate over the values of a node variable in blocks of time steps
+        and nodes.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+
+        Yields ``(steps, nodes, values)`` tuples. ``steps`` and ``nodes``
+        are ranges of the 1-based steps and node ids of the block and
+        ``values`` is an array with shape ``(len(steps), len(nodes))``. The
+        blocks are aligned to the chunks of the dataset and no block is
+        larger than the memory budget (unless a single chunk already is),
+        so arbitrarily large files can be processed in constant memory:
+
+        >>> for steps, nodes, values in e.iter_node_variable_values(
+        ...         "u", memory_budget=2 ** 28):  # doctest: +SKIP
+        ...     _n = slice(nodes.start - 1, nodes.stop - 1)
+        ...     maximum[_n] = np.maximum(maximum[_n], values.max(axis=0))
+
+        :type name: str
+        :param name: The name of the variable.
+        :type steps: int or tuple
+        :param steps: The time steps to iterate over. Either a single step,
+            a tuple of the first and last step (both 1-based and inclusive),
+            or ``None`` for all steps.
+        :type node_chunk: int
+        :param node_chunk: The number of nodes per block. Rounded down to a
+            multiple of the chunk shape if larger than it. Whole steps if
+            possible and if not given.
+        :type memory_budget: int
+        :param memory_budget: The largest size of a block in bytes.
+        """
+        # 1-based indexing!
+        idx = self._get_name_index("name_nod_var", name) + 1
+        d_name = "vals_nod_var%i" % idx
+        return self._iter_time_blocks(d_name, steps, node_chunk, memory_budget)
 
     def put_side_set_params(self, id, numSetSides, numSetDistFacts):
         """
@@ -681,12 +2364,11 @@ class exodus(object):
         """
         assert numSetDistFacts == 0, "Only 0 is currently supported."
 
-        assert id not in self._f.variables["ss_prop1"][:], (
+        assert self._get_catalogue_index("ss_prop1", id) is None, (
             "Side set id %i already exists." % id
         )
 
-        _t = self._f.variables["ss_status"][:]
-        count = len(_t[_t > 0])
+        count = len([_i for _i in self._catalogue["ss_status"] if _i > 0])
         assert (
             count < self._f.dimensions["num_side_sets"]
         ), "Maximum number of side sets reached."
@@ -699,16 +2381,22 @@ class exodus(object):
         # Create the dimension and variables.
         self._f.dimensions[dim_name] = numSetSides
         self._f.create_variable(
-            elem_ss_name, (dim_name,), dtype=np.int32, **self._comp_opts
+            elem_ss_name,
+            (dim_name,),
+            dtype=self.__bulk_dtype,
+            **self._comp_opts
         )
         self._f.create_variable(
-            side_ss_name, (dim_name,), dtype=np.int32, **self._comp_opts
+            side_ss_name,
+            (dim_name,),
+            dtype=self.__bulk_dtype,
+            **self._comp_opts
         )
 
         # Set meta-data.
-        self._f.variables["ss_status"][idx - 1] = 1
+        self._set_catalogue_value("ss_status", idx - 1, 1)
         # For reasons I don't understand, this is ALWAYS ss_prop1.
-        self._f.variables["ss_prop1"][idx - 1] = id
+        self._set_catalogue_value("ss_prop1", idx - 1, id)
 
     def put_side_set(self, id, sideSetElements, sideSetSides):
         """
@@ -723,10 +2411,10 @@ class exodus(object):
         :param sideSetSides: The side set sides.
         """
         # Find the side set.
-        _idx = self._f.variables["ss_prop1"][:]
-        assert id in _idx, "Could not find side set with id %i." % id
+        _idx = self._get_catalogue_index("ss_prop1", id)
+        assert _idx is not None, "Could not find side set with id %i." % id
         # 1-based indexing!
-        idx = np.argwhere(_idx == id)[0][0] + 1
+        idx = _idx + 1
 
         elem_ss_name = "elem_ss%i" % idx
         side_ss_name = "side_ss%i" % idx
@@ -744,37 +2432,30 @@ class exodus(object):
         :param name: The string of the side set.
         """
         # Find the side set.
-        _idx = self._f.variables["ss_prop1"][:]
-        assert id in _idx, "Could not find side set with id %i." % id
+        _idx = self._get_catalogue_index("ss_prop1", id)
+        assert _idx is not None, "Could not find side set with id %i." % id
         # 1-based indexing!
-        idx = np.argwhere(_idx == id)[0][0] + 1
+        idx = _idx + 1
 
         self._f.variables["ss_names"][idx - 1] = b""
         self._f.variables["ss_names"][idx - 1, : len(name)] = [
             _i.encode() if hasattr(_i, "encode") else _i for _i in name
         ]
+        self._name_cache.pop("ss_names", None)
 
     def get_side_set_names(self):
         """
         Get a list of the side set names in the exodus file.
         """
-        _side_sets = self._f.variables["ss_names"][:]
-        side_sets = []
-        for _i in _side_sets:
-            side_sets.append(
-                "".join(
-                    _j.decode() if hasattr(_j, "decode") else _j for _j in _i
-                )
-            )
-        return side_sets
+        return list(self._get_names("ss_names"))
 
     def get_side_set_ids(self):
         """
         Get a list of side set ids in the exodus file.
         """
-        return [int(_i) for _i in self._f.variables["ss_prop1"][:]]
+        return [int(_i) for _i in self._catalogue["ss_prop1"]]
 
-    def get_side_set(self, id):
+    def get_side_set(self, id, out=None):
         """
         Get element and side ids for a certain side set.
 
@@ -783,17 +2464,30 @@ class exodus(object):
 
         :type id: int
         :param id: The id of the side set.
-        """
-        ids = self.get_side_set_ids()
-        if id not in ids:
+        :type out: tuple of :class:`numpy.ndarray`
+        :param out: Read the element and side ids into these two arrays
+            instead of allocating new ones. They must be C-contiguous. The
+            values are converted to their dtype while reading. This
+            parameter is not part of the official exodus Python API.
+        """
+        idx = self._get_catalogue_index("ss_prop1", id)
+        if idx is None:
+            ids = self.get_side_set_ids()
             raise ValueError(
                 "No side set with id %i in file. Available "
                 "ids: %s." % (id, ", ".join(["%i" % _i for _i in ids]))
             )
-        id = ids.index(id) + 1
+        id = idx + 1
         side_name = "side_ss%i" % id
         elem_name = "elem_ss%i" % id
 
+        if out is not None:
+            if len(out) != 2:
+                raise ValueError("out must contain two arrays.")
+            return (
+                self._read_into(elem_name, out[0]),
+                self._read_into(side_name, out[1]),
+            )
         return self._f.variables[elem_name][:], self._f.variables[side_name][:]
 
     def get_elem_type_for_block(self, id):
@@ -811,6 +2505,12 @@ class exodus(object):
         var_name = "connect%i" % id
         if var_name not in self._f.variables:
             raise ValueError("No element block with id %i in file." % id)
+        return self._get_elem_type(var_name)
+
+    def _get_elem_type(self, var_name):
+        """
+        Get the element type of a connectivity variable.
+        """
         elem_type = self._f[var_name].attrs["elem_type"]
         try:
             elem_type = elem_type.decode()
@@ -827,31 +2527,163 @@ class exodus(object):
         nodes on each face the the seconds are the local node ids for the
         side set in the exodus file.
 
+        The elements of the side set can be in any element block. All
+        sides of an element block are gathered at once. Triangles in 3D
+        meshes are triangular shells with the two faces as sides 1 and 2
+        and the edges as sides 3 to 5.
+
         :type id: int
         :param id: The id of the side set.
         """
-        # XXX: Currently only works for files with a single element block.
-        elem_type = self.get_elem_type_for_block(id=1)
-
         elem_idx, side_idx = self.get_side_set(id=id)
-        _sin = _SIDE_SET_NUMBERING[elem_type]
-
-        num_nodes = np.ones_like(elem_idx) * _sin.shape[1]
-        # This one is a bit tricky. Not sure if the current solution is
-        # optimal but it gets the trick done and does avoid a bunch of copies.
-        # Step 1: Get all elements in the side set. Account for 1-based
-        # indexing
-        _e = self._f.variables["connect1"][:][elem_idx - 1]
-        # Step 2: From each element we have to pick these sides.
-        _s = _sin[side_idx - 1]
-        # This still has some additional allocations but otherwise indexes
-        # pretty directly.
-        local_node_ids = _e.ravel()[
-            (_s + np.arange(_e.shape[0])[:, np.newaxis] * _e.shape[1]).ravel()
+
+        # The elements are numbered consecutively across the blocks in the
+        # order of the blocks in the file.
+        blocks = [
+            (_id, "connect%i" % (_i + 1))
+            for _i, _id in enumerate(self._catalogue["eb_prop1"])
+            if "connect%i" % (_i + 1) in self._f.variables
         ]
+        offsets = np.cumsum(
+            [0] + [self._f.variables[_b[1]].shape[0] for _b in blocks]
+        )
+        if elem_idx.size and not (
+            0 < elem_idx.min() and elem_idx.max() <= offsets[-1]
+        ):
+            raise ValueError(
+                "Side set elements must be 0 < element <= %i." % offsets[-1]
+            )
+        owner = np.searchsorted(offsets, elem_idx, side="left") - 1
+
+        num_nodes = np.zeros_like(elem_idx)
+        gathered = []
+        for _b in np.unique(owner):
+            block_id, var_name = blocks[_b]
+            sel = np.flatnonzero(owner == _b)
+            # Only the rows of the elements in the side set are read.
+            _e = self._read_rows(var_name, elem_idx[sel] - offsets[_b])
+            _sin = _side_set_numbering(
+                self._get_elem_type(var_name), _e.shape[1], self.num_dims
+            )
+            _side = side_idx[sel]
+            if not (0 < _side.min() and _side.max() <= _sin.shape[0]):
+                raise ValueError(
+                    "Side ids in block %i must be 0 < side <= %i."
+                    % (block_id, _sin.shape[0])
+                )
+            # From each element we have to pick these sides. The tables
+            # are padded with -1 at the end.
+            _s = _sin[_side - 1]
+            valid = _s >= 0
+            num_nodes[sel] = valid.sum(axis=1)
+            gathered.append(
+                (sel, valid, np.take_along_axis(_e, np.maximum(_s, 0), 1))
+            )
+
+        # Assemble everything in the order of the side set.
+        starts = np.cumsum(num_nodes) - num_nodes
+        dtype = np.result_type(
+            *([np.int32] + [_g[2].dtype for _g in gathered])
+        )
+        local_node_ids = np.empty(num_nodes.sum(), dtype=dtype)
+        for sel, valid, nodes in gathered:
+            positions = starts[sel][:, np.newaxis] + np.arange(valid.shape[1])
+            local_node_ids[positions[valid]] = nodes[valid]
 
         return num_nodes, local_node_ids
 
+    def _variable(self, var_name):
+        """
+        Get a variable, memory mapped if requested and possible.
+
+        :type var_name: str
+        :param var_name: The name of the variable.
+        """
+        if not self._mmap:
+            return self._f.variables[var_name]
+        if var_name not in self._mmap_cache:
+            self._mmap_cache[var_name] = self._memory_map(var_name)
+        if self._mmap_cache[var_name] is None:
+            return self._f.variables[var_name]
+        return self._mmap_cache[var_name]
+
+    def _read(self, var_name, row=None, out=None):
+        """
+        Read all values of a variable or of a single row of it.
+
+        Returns a lazy proxy instead if requested.
+
+        :type var_name: str
+        :param var_name: The name of the variable.
+        :type row: int
+        :param row: The 0-based index along the first axis.
+        :type out: :class:`numpy.ndarray`
+        :param out: If given, read into this array with
+            :meth:`_read_into`.
+        """
+        if out is not None:
+            return self._read_into(var_name, out, row=row)
+        variable = self._variable(var_name)
+        if self._lazy and not isinstance(variable, np.ndarray):
+            return _lazy.LazyArray(variable, row=row)
+        if row is None:
+            return variable[:]
+        return variable[row]
+
+    def _read_into(self, var_name, out, row=None):
+        """
+        Read all values of a variable or of a single row of it into an
+        existing array.
+
+        HDF5 reads directly into the array and converts the values to its
+        dtype so nothing else is allocated.
+
+        :type var_name: str
+        :param var_name: The name of the variable.
+        :type out: :class:`numpy.ndarray`
+        :param out: The array to read into.
+        :type row: int
+        :param row: The 0-based index along the first axis.
+        """
+        variable = self._variable(var_name)
+        if row is None:
+            _check_out(out, tuple(variable.shape))
+            sel = np.s_[...]
+        else:
+            _check_out(out, tuple(variable.shape[1:]))
+            sel = np.s_[row, ...]
+
+        if hasattr(variable, "read_direct"):
+            # Instrumented variables.
+            variable.read_direct(out, sel)
+        elif hasattr(variable, "_h5ds"):
+            variable._h5ds.read_direct(out, sel)
+        else:
+            # Memory mapped and netCDF-3 variables.
+            out[...] = variable[sel]
+        return out
+
+    def _memory_map(self, var_name):
+        """
+        Memory map a contiguous and uncompressed dataset.
+
+        Returns ``None`` if the dataset is not stored like that or its
+        data has not been allocated in the file.
+        """
+        h5ds = self._f.variables[var_name]._h5ds
+        if h5ds.chunks is not None or h5ds.external or not h5ds.size:
+            return None
+        offset = h5ds.id.get_offset()
+        if offset is None:
+            return None
+        return np.memmap(
+            h5ds.file.filename,
+            dtype=h5ds.dtype,
+            mode="r",
+            offset=offset,
+            shape=h5ds.shape,
+        )
+
     def get_coord(self, i):
         """
         Get x, y, z of i-th node in the exodus file.
@@ -862,33 +2694,55 @@ class exodus(object):
             In that case it will still return a three-tuple, but each now
             contains multiple variables.
         """
+        names = ["coordx", "coordy"]
+        if self._f.dimensions["num_dim"] == 3:
+            names.append("coordz")
+
         # Make it work with single indices and arrays.
-        i = list(np.atleast_1d(i) - 1)
+        i = np.atleast_1d(i)
         if len(i) == 1:
-            i = i[0]
+            i = i[0] - 1
             if not 1 <= i + 1 <= self._f.dimensions["num_nodes"]:
                 raise ValueError(
                     "Invalid index. Coordinate bounds: [1, %i]."
                     % self._f.dimensions["num_nodes"]
                 )
+            coords = [self._variable(_n)[i] for _n in names]
+        else:
+            # All coordinates have the same shape so the reads are only
+            # planned once.
+            plan = self._plan_rows("coordx", i)
+            coords = [self._read_rows(_n, i, plan=plan) for _n in names]
 
-        x = self._f.variables["coordx"][i]
-        y = self._f.variables["coordy"][i]
-        if self._f.dimensions["num_dim"] == 2:
-            return x, y, np.zeros_like(x)
-        return x, y, self._f.variables["coordz"][i]
+        if len(coords) == 2:
+            coords.append(np.zeros_like(coords[0]))
+        return tuple(coords)
 
-    def get_coords(self):
+    def get_coords(self, out=None):
         """
         Returns all nodes in x, y, z.
-        """
-        x = self._f.variables["coordx"][:]
-        y = self._f.variables["coordy"][:]
-        if self._f.dimensions["num_dim"] == 2:
-            return x, y, np.zeros_like(x)
-        return x, y, self._f.variables["coordz"][:]
 
-    def get_elem_connectivity(self, id, indices=None):
+        :type out: tuple of :class:`numpy.ndarray`
+        :param out: Read the coordinates into these three arrays (or the
+            rows of an array with shape ``(3, num_nodes)``) instead of
+            allocating new ones. They must be C-contiguous. The values are
+            converted to their dtype while reading. This parameter is not
+            part of the official exodus Python API.
+        """
+        if out is None:
+            out = (None, None, None)
+        elif len(out) != 3:
+            raise ValueError("out must contain three arrays.")
+        x = self._read("coordx", out=out[0])
+        y = self._read("coordy", out=out[1])
+        if self._f.dimensions["num_dim"] == 3:
+            return x, y, self._read("coordz", out=out[2])
+        if out[2] is None:
+            return x, y, np.zeros(x.shape, dtype=x.dtype)
+        out[2][...] = 0
+        return x, y, out[2]
+
+    def get_elem_connectivity(self, id, indices=None, out=None):
         """
         Get the connectivity for a certain element block.
 
@@ -905,18 +2759,67 @@ class exodus(object):
             second and third returned item are always stats for the whole
             connectivity array regardless of this argument. This parameter
             is not part of the official exodus Python API.
+        :type out: :class:`numpy.ndarray`
+        :param out: Read the connectivity into this array instead of
+            allocating a new one. Must be C-contiguous and have the correct
+            shape. The values are converted to its dtype, e.g. to 64 bit
+            integers. This parameter is not part of the official exodus
+            Python API.
         """
         var_name = "connect%i" % id
-        conn = self._f.variables[var_name]
+        conn = self._variable(var_name)
 
         # Read everything if indices is not given.
         if indices is None:
-            indices = slice(None)
+            values = self._read(var_name, out=out)
         else:
-            indices = np.array(indices)
-            indices = list(indices - 1)
+            values = self._read_rows(var_name, indices)
+            if out is not None:
+                _check_out(out, values.shape)
+                out[...] = values
+                values = out
+        return values, conn.shape[0], conn.shape[1]
+
+    def iter_elem_connectivity(
+        self, id, chunk_rows=None, memory_budget=_DEFAULT_MEMORY_BUDGET
+    ):
+        """
+        Iterate over the connectivity of an element block in blocks of
+        elements.
+
+        .. note::
+
+            This method does not have a counter part in the official exodus
+            Python API.
+
+        Yields ``(elements, connectivity)`` tuples with ``elements`` being a
+        range of the 1-based element ids in the block. The blocks are
+        aligned to the chunks of the dataset and no block is larger than
+        the memory budget (unless a single chunk already is).
+
+        :type id: int
+        :param id: Id of the element block.
+        :type chunk_rows: int
+        :param chunk_rows: The number of elements per block. Rounded down to
+            a multiple of the chunk shape if larger than it. Determined from
+            the memory budget if not given.
+        :type memory_budget: int
+        :param memory_budget: The largest size of a block in bytes.
+        """
+        var_name = "connect%i" % id
+        var = self._f.variables[var_name]
+        num_elems, num_nodes = var.shape
+        if chunk_rows is None:
+            chunk_rows = memory_budget // (var.dtype.itemsize * num_nodes)
+        chunks = getattr(var, "chunks", None) or (1, num_nodes)
+        rows = _aligned_block(num_elems, chunks[0], chunk_rows)
+
+        def _iterate():
+            for _s in range(0, num_elems, rows):
+                _e = min(num_elems, _s + rows)
+                yield range(_s + 1, _e + 1), self._variable(var_name)[_s:_e]
 
-        return conn[indices], conn.shape[0], conn.shape[1]
+        return _iterate()
 
     def _write_attrs(self, title):
         """
@@ -929,16 +2832,19 @@ class exodus(object):
         )
         self._f.attrs["file_size"] = np.array([1], dtype=np.int32)
         self._f.attrs["maximum_name_length"] = np.array([32], dtype=np.int32)
-        self._f.attrs["int64_status"] = np.array([0], dtype=np.int32)
+        self._f.attrs["int64_status"] = np.array(
+            [self.__int64_status], dtype=np.int32
+        )
         self._f.attrs["title"] = np.string_(title)
 
     def _create_variables(self):
         # Time steps.
+        opts = dict(self._comp_opts)
+        chunks = self._time_chunks()
+        if chunks is not None:
+            opts["chunks"] = chunks
         self._f.create_variable(
-            "/time_whole",
-            ("time_step",),
-            dtype=self.__f_dtype,
-            **self._comp_opts
+            "/time_whole", ("time_step",), dtype=self.__f_dtype, **opts
         )
 
         # Element block stuff.
@@ -955,7 +2861,7 @@ class exodus(object):
         self._f.create_variable(
             "/eb_prop1",
             ("num_el_blk",),
-            dtype=np.int32,
+            dtype=self.__id_dtype,
             data=[-1] * self._f.dimensions["num_el_blk"],
             **self._comp_opts
         )
@@ -989,7 +2895,7 @@ class exodus(object):
             self._f.create_variable(
                 "/ss_prop1",
                 ("num_side_sets",),
-                dtype=np.int32,
+                dtype=self.__id_dtype,
                 data=[-1] * self._f.dimensions["num_side_sets"],
                 **self._comp_opts
             )
@@ -1003,15 +2909,32 @@ class exodus(object):
 
     def __del__(self):
         try:
-            self._f.close()
+            self.close()
         except Exception:  # pragma: no cover
             pass
 
     def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        # Finish all pending background writes first.
+        writer, self._writer = self._writer, None
+        error = writer.stop() if writer is not None else None
+        pool, self._compression_pool = self._compression_pool, None
+        if pool is not None:
+            pool.shutdown()
         try:
-            self._f.close()
-        except Exception:  # pragma: no cover
-            pass
+            self._publish(self._num_steps)
+            # Remove the steps reserved in advance but never written.
+            if self._mode != "r" and self._allocated_steps > self._num_steps:
+                self._file.resize_dimension("time_step", self._num_steps)
+        finally:
+            try:
+                self._file.close()
+            except Exception:  # pragma: no cover
+                pass
+        if error is not None:
+            raise error
 
     def __enter__(self):
         """
@@ -1023,4 +2946,270 @@ class exodus(object):
         """
         Enable usage as a context manager.
         """
-        self.__del__()
+        if exc_type is None:
+            self.close()
+        else:
+            self.__del__()
+
+
+class _TimestepWriter(object):
+    """
+    Collects a number of time steps in memory before writing them at once.
+
+    Get an instance with :meth:`exodus.timestep_writer`.
+
+    :type exo: :class:`exodus`
+    :param exo: The file to write to.
+    :type buffer_steps: int
+    :param buffer_steps: The number of time steps to buffer.
+    """
+
+    def __init__(self, exo, buffer_steps):
+        assert buffer_steps > 0, "buffer_steps must be larger than 0."
+        self._exo = exo
+        self._buffer_steps = int(buffer_steps)
+        # First step of the current window. None if nothing is buffered.
+        self._start = None
+        # Buffers and masks of which rows have been set. Allocated on
+        # first use and reused for each window.
+        self._time = None
+        self._node = {}
+        self._elem = {}
+        self._glob = None
+
+    def _row(self, step):
+        """
+        Get the row in the buffers for a step, flushing if necessary.
+        """
+        assert step > 0, "Step must be larger than 0."
+        if self._start is not None and not (
+            self._start <= step < self._start + self._buffer_steps
+        ):
+            self.flush()
+        if self._start is None:
+            self._start = step
+        return step - self._start
+
+    def _buffer(self, var_name, columns):
+        """
+        Allocate a buffer and mask matching the dtype of a dataset.
+        """
+        dtype = self._exo._f.variables[var_name].dtype
+        if columns is None:
+            shape = (self._buffer_steps,)
+        else:
+            shape = (self._buffer_steps, columns)
+        return np.empty(shape, dtype=dtype), np.zeros(shape[0], dtype=bool)
+
+    def put_time(self, step, value):
+        """
+        Put time step and value into the buffer.
+
+        :type step: int
+        :param step: The index of the time step. First is 1.
+        :type value: float
+        :param value: The actual time at that index.
+        """
+        row = self._row(step)
+        if self._time is None:
+            self._time = self._buffer("time_whole", None)
+        self._time[0][row] = value
+        self._time[1][row] = True
+
+    def put_node_variable_values(self, name, step, values):
+        """
+        Put node values into variable name at step into the buffer.
+
+        :type name: str
+        :param name: The name of the variable.
+        :type step: int
+        :param step: The time step at which to put the values.
+        :type values: :class:`numpy.ndarray`
+        :param values: The actual values.
+        """
+        # Validate the name before touching the buffers.
+        d_name = "vals_nod_var%i" % (
+            self._exo._get_name_index("name_nod_var", name) + 1
+        )
+        row = self._row(step)
+        if d_name not in self._node:
+            self._node[d_name] = self._buffer(
+                d_name, self._exo._f.dimensions["num_nodes"]
+            )
+        buf, mask = self._node[d_name]
+        buf[row] = values
+        mask[row] = True
+
+    def put_element_variable_values(self, blockId, name, step, values):
+        """
+        Put values into element block id and variable name at step into the
+        buffer.
+
+        :type blockId: int
+        :param blockId: The block id.
+        :type name: str
+        :param name: The name of the variable.
+        :type step: int
+        :param step: The time step at which to put the values.
+        :type values: :class:`numpy.ndarray`
+        :param values: The actual values.
+        """
+        # Chunks of newly created datasets span the whole buffer in time.
+        d_name = self._exo._require_element_variable(
+            blockId, name, chunk_steps=self._buffer_steps
+        )
+        row = self._row(step)
+        if d_name not in self._elem:
+            self._elem[d_name] = self._buffer(
+                d_name, self._exo._f.dimensions["num_el_in_blk%i" % blockId]
+            )
+        buf, mask = self._elem[d_name]
+        buf[row] = values
+        mask[row] = True
+
+    def put_global_variable_value(self, name, step, value):
+        """
+        Put global variable value and variable name at time step into the
+        buffer.
+
+        :type name: str
+        :param name: The name of the variable.
+        :type step: int
+        :param step: The index of the time step. First is 1.
+        :type value: float
+        :param value: The actual value.
+        """
+        idx = self._exo._get_name_index("name_glo_var", name)
+        row = self._row(step)
+        if self._glob is None:
+            buf, _ = self._buffer(
+                "vals_glo_var", self._exo._f.dimensions["num_glo_var"]
+            )
+            self._glob = buf, np.zeros(buf.shape, dtype=bool)
+        self._glob[0][row, idx] = value
+        self._glob[1][row, idx] = True
+
+    def flush(self):
+        """
+        Write all buffered time steps to the file.
+        """
+        if self._start is None:
+            return
+        start = self._start
+        self._start = None
+
+        buffers = [("time_whole", self._time)]
+        buffers.extend(sorted(self._node.items()))
+        buffers.extend(sorted(self._elem.items()))
+
+        # Resize the time dimension only once.
+        last_row = -1
+        for _, _b in buffers:
+            if _b is not None and _b[1].any():
+                last_row = max(last_row, np.flatnonzero(_b[1])[-1])
+        if self._glob is not None and self._glob[1].any():
+            last_row = max(last_row, np.flatnonzero(self._glob[1].any(1))[-1])
+        if last_row < 0:
+            return
+        self._exo._resize_time_if_necessary(start + last_row)
+
+        # Only write rows that have actually been set.
+        for var_name, _b in buffers:
+            if _b is None:
+                continue
+            buf, mask = _b
+            for _s, _e in _contiguous_runs(np.flatnonzero(mask)):
+                self._exo._put_time_block(var_name, start + _s, buf[_s:_e])
+            mask[:] = False
+
+        if self._glob is not None and self._glob[1].any():
+            buf, mask = self._glob
+            rows = np.flatnonzero(mask.any(1))
+            _s, _e = rows[0], rows[-1] + 1
+            # Cells that have not been set retain their values in the file.
+            if not mask[_s:_e].all():
+                existing = self._exo._f.variables["vals_glo_var"][
+                    start - 1 + _s : start - 1 + _e  # NOQA
+                ]
+                buf[_s:_e][~mask[_s:_e]] = existing[~mask[_s:_e]]
+            self._exo._put_time_block("vals_glo_var", start + _s, buf[_s:_e])
+            mask[:] = False
+
+        # All buffered steps are complete.
+        self._exo._publish(start + last_row)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+
+
+class _BackgroundWriter(object):
+    """
+    Executes write calls in a single background thread.
+
+    :type maxsize: int
+    :param maxsize: The maximum number of queued calls. Submitting more
+        blocks until the thread caught up.
+    """
+
+    def __init__(self, maxsize):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._run, name="pyexodus-writer"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                # Drop everything after an error until it has been raised.
+                if self._error is None:
+                    func, args, kwargs = item
+                    func(*args, **kwargs)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def in_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def raise_error(self):
+        """
+        Raise the error of a previous call if there was any.
+        """
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queue a call. Blocks if the queue is full.
+        """
+        self.raise_error()
+        self._queue.put((func, args, kwargs))
+
+    def join(self):
+        """
+        Wait until all queued calls have been executed.
+        """
+        self._queue.join()
+        self.raise_error()
+
+    def stop(self):
+        """
+        Execute all queued calls and stop the thread.
+
+        Returns the pending error, if any.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        error, self._error = self._error, None
+        return error
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+import os
+import subprocess
+import sys
+
+import pyexodus
+
+
+def test_import_is_lazy():
+    """
+    Importing pyexodus must neither import h5netcdf/h5py nor call git.
+    """
+    code = (
+        "import sys; import pyexodus; "
+        "print(','.join(sorted(set(sys.modules) & "
+        "{'h5netcdf', 'h5py', 'subprocess', 'concurrent.futures'})))"
+    )
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(pyexodus.__file__))
+    env["PYTHONPATH"] = os.pathsep.join(
+        [root] + [_i for _i in [env.get("PYTHONPATH")] if _i]
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], env=env)
+    assert output.decode().strip() == ""
+
+
+def test_version():
+    assert isinstance(pyexodus.__version__, str)
+    assert pyexodus.__version__
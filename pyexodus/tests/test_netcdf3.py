@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:copyright:
+    Lion Krischer (lionkrischer@gmail.com), 2020
+:license:
+    MIT License
+"""
+import os
+import struct
+
+import h5netcdf
+import numpy as np
+import pytest
+
+from pyexodus import exodus
+from pyexodus import _netcdf3
+
+
+def _write_example(filename):
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=8,
+    ) as e:
+        e.put_coords(np.arange(5.0), np.arange(5.0) * 2, np.arange(5.0) * 3)
+        e.put_elem_blk_info(1, "HEX", 6, 3, 0)
+        e.put_elem_connectivity(1, np.arange(6 * 3), shift_indices=1)
+        e.put_side_set_params(4, 2, 0)
+        e.put_side_set(4, np.array([1, 3]), np.array([2, 4]))
+        e.put_side_set_name(4, "edge")
+        e.set_global_variable_number(1)
+        e.put_global_variable_name("energy", 1)
+        e.set_node_variable_number(2)
+        e.put_node_variable_name("u", 1)
+        e.put_node_variable_name("v", 2)
+        e.set_element_variable_number(1)
+        e.put_element_variable_name("s", 1)
+        for step in range(1, 4):
+            e.put_time(step, step * 0.5)
+            e.put_global_variable_value("energy", step, step * 2.0)
+            e.put_node_variable_values("u", step, np.arange(5.0) * step)
+            e.put_node_variable_values("v", step, -np.arange(5.0) * step)
+            e.put_element_variable_values(1, "s", step, np.ones(6) * step)
+
+
+def _attr(value):
+    if isinstance(value, bytes):
+        return value.decode()
+    return value
+
+
+def _convert_to_netcdf3(filename, output, version):
+    netcdf = pytest.importorskip("scipy.io").netcdf_file
+    with h5netcdf.File(filename, mode="r") as f, netcdf(
+        output, mode="w", version=version
+    ) as out:
+        # The record dimension has to be the first one.
+        for name, size in sorted(
+            f.dimensions.items(), key=lambda x: x[1] is not None
+        ):
+            out.createDimension(name, size)
+        for key, value in f.attrs.items():
+            setattr(out, key, _attr(value))
+        for name, var in f.variables.items():
+            dtype = var.dtype if var.dtype.kind != "S" else "c"
+            v = out.createVariable(name, dtype, var.dimensions)
+            for key, value in var.attrs.items():
+                setattr(v, key, _attr(value))
+            if var.dimensions and f.dimensions[var.dimensions[0]] is None:
+                v[: var.shape[0]] = var[:]
+            else:
+                v[:] = var[:]
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_read_netcdf3(tmpdir, version):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+    netcdf3_filename = os.path.join(tmpdir.strpath, "example_nc3.e")
+    _write_example(filename)
+    _convert_to_netcdf3(filename, netcdf3_filename, version)
+
+    assert not _netcdf3.is_netcdf3(filename)
+    assert _netcdf3.is_netcdf3(netcdf3_filename)
+
+    with exodus(filename, mode="r") as a, exodus(
+        netcdf3_filename, mode="r"
+    ) as b:
+        assert isinstance(b._f, _netcdf3.File)
+        assert b._num_steps == 3
+
+        for _a, _b in zip(a.get_coords(), b.get_coords()):
+            np.testing.assert_equal(_a, _b)
+        np.testing.assert_equal(a.get_coord(3), b.get_coord(3))
+        for _a, _b in zip(
+            a.get_elem_connectivity(1), b.get_elem_connectivity(1)
+        ):
+            np.testing.assert_equal(_a, _b)
+        assert b.get_elem_type_for_block(1) == "HEX"
+        assert b.get_side_set_ids() == [4]
+        assert b.get_side_set_names() == a.get_side_set_names()
+        for _a, _b in zip(a.get_side_set(4), b.get_side_set(4)):
+            np.testing.assert_equal(_a, _b)
+        assert b.get_global_variable_names() == ["energy"]
+        assert b.get_node_variable_names() == ["u", "v"]
+        assert b.get_element_variable_names() == ["s"]
+        np.testing.assert_equal(
+            b.get_global_variable_history("energy"), [2.0, 4.0, 6.0]
+        )
+        for step in range(1, 4):
+            for name in ["u", "v"]:
+                np.testing.assert_equal(
+                    a.get_node_variable_values(name, step),
+                    b.get_node_variable_values(name, step),
+                )
+            np.testing.assert_equal(
+                b.get_element_variable_values(1, "s", step), np.ones(6) * step
+            )
+        np.testing.assert_equal(
+            b.get_node_variable_history("v", [5, 2]),
+            a.get_node_variable_history("v", [5, 2]),
+        )
+
+        # Memory mapped and read-only.
+        x = b.get_coords()[0]
+        assert not x.flags.writeable
+        assert isinstance(x.base, np.memmap) or isinstance(
+            x.base.base, np.memmap
+        )
+
+    with pytest.raises(AssertionError):
+        exodus(netcdf3_filename, mode="a")
+
+
+def _cdf5(num_records, dims, variables, data):
+    """
+    Build a small CDF-5 file. All variables are int16.
+    """
+
+    def _name(name):
+        name = name.encode()
+        return struct.pack(">q", len(name)) + name + b"\x00" * (-len(name) % 4)
+
+    header = b"CDF\x05" + struct.pack(">Q", num_records)
+    header += struct.pack(">iq", 10, len(dims))
+    for name, size in dims:
+        header += _name(name) + struct.pack(">q", size)
+    # No global attributes.
+    header += struct.pack(">iq", 0, 0)
+    header += struct.pack(">iq", 11, len(variables))
+    offsets = []
+    for name, dim_ids in variables:
+        header += _name(name) + struct.pack(">q", len(dim_ids))
+        header += b"".join(struct.pack(">q", _i) for _i in dim_ids)
+        header += struct.pack(">iqiq", 0, 0, 3, 0)
+        offsets.append(len(header))
+        header += struct.pack(">q", 0)
+
+    # Fix the offsets.
+    header = bytearray(header)
+    begin = len(header)
+    for offset, (_o, _d) in zip(offsets, data):
+        header[offset : offset + 8] = struct.pack(">q", begin + _o)  # NOQA
+    return bytes(header) + b"".join(_d for _, _d in data)
+
+
+def test_cdf5_single_record_variable(tmpdir):
+    filename = os.path.join(tmpdir.strpath, "example.nc")
+
+    # A single int16 record variable with three values per record is not
+    # padded.
+    records = np.arange(9, dtype=">i2").reshape((3, 3))
+    fixed = np.array([7, 8, 9, 10], dtype=">i2")
+    with open(filename, "wb") as fh:
+        fh.write(
+            _cdf5(
+                num_records=2 ** 64 - 1,
+                dims=[("time_step", 0), ("three", 3), ("four", 4)],
+                variables=[("fixed", [2]), ("vals", [0, 1])],
+                data=[(0, fixed.tobytes()), (8, records.tobytes())],
+            )
+        )
+
+    assert _netcdf3.is_netcdf3(filename)
+    with _netcdf3.File(filename) as f:
+        assert f.dimensions == {"time_step": None, "three": 3, "four": 4}
+        # Streaming - the number of records is determined from the file size.
+        assert f._current_dim_sizes["time_step"] == 3
+        assert f.variables["vals"].shape == (3, 3)
+        assert f.variables["vals"].dimensions == ("time_step", "three")
+        np.testing.assert_equal(f.variables["vals"][:], records)
+        np.testing.assert_equal(f["fixed"][:], fixed)
+        np.testing.assert_equal(np.asarray(f.variables["vals"])[1], [3, 4, 5])
@@ -8,12 +8,16 @@
 """
 import os
 import platform
+import warnings
 
+import h5py
 import numpy as np
 import pytest
 
 
 from pyexodus import exodus
+from pyexodus._lazy import LazyArray
+from pyexodus.core import _plan_gather
 
 
 _p = [
@@ -96,6 +100,60 @@ def test_read_global_variables(tmpdir, io_size):
         np.testing.assert_almost_equal(value, 1.1)
 
 
+def test_get_global_variable_history(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=2,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.set_global_variable_number(3)
+        e.put_global_variable_name("energy", 1)
+        e.put_global_variable_name("dt", 2)
+        e.put_global_variable_name("residual", 3)
+        for step in range(1, 5):
+            e.put_time(step, float(step))
+            e.put_global_variable_value("energy", step, step * 1.0)
+            e.put_global_variable_value("dt", step, step * 2.0)
+            e.put_global_variable_value("residual", step, step * 3.0)
+
+        # Works while writing.
+        np.testing.assert_allclose(
+            e.get_global_variable_history("energy"), [1.0, 2.0, 3.0, 4.0]
+        )
+
+    with exodus(filename, mode="r") as e:
+        np.testing.assert_allclose(
+            e.get_global_variable_history("dt"), [2.0, 4.0, 6.0, 8.0]
+        )
+        values = e.get_global_variable_history(["residual", "energy"])
+        assert values.shape == (4, 2)
+        np.testing.assert_allclose(values[:, 0], [3.0, 6.0, 9.0, 12.0])
+        np.testing.assert_allclose(values[:, 1], [1.0, 2.0, 3.0, 4.0])
+        np.testing.assert_allclose(
+            e.get_global_variable_history("energy", steps=(2, 3)), [2.0, 3.0]
+        )
+        np.testing.assert_allclose(
+            e.get_global_variable_history(["dt"], steps=4), [[8.0]]
+        )
+
+        with pytest.raises(ValueError):
+            e.get_global_variable_history("energy", steps=(3, 5))
+        with pytest.raises(ValueError):
+            e.get_global_variable_history("energy", steps=0)
+        with pytest.raises(ValueError):
+            e.get_global_variable_history("random")
+
+
 def test_get_side_set_ids(tmpdir, io_size):
     filename = os.path.join(tmpdir.strpath, "example.e")
 
@@ -344,6 +402,196 @@ def test_get_side_set_node_list_quad(tmpdir, io_size):
     np.testing.assert_equal(local_node_ids, [11, 12, 16, 17, 21, 22, 26, 23])
 
 
+def test_get_side_set_node_list_reads_only_referenced_rows(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    connectivity = np.arange(100 * 4).reshape((100, 4)) + 1
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=2,
+        numNodes=400,
+        numElems=100,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_elem_blk_info(1, "QUAD", 100, 4, 0)
+        e.put_elem_connectivity(1, connectivity)
+        e.put_side_set_params(4, 5, 0)
+        # Unsorted with duplicates and a run of consecutive elements.
+        e.put_side_set(
+            4,
+            np.array([50, 3, 50, 4, 99], dtype=np.int32),
+            np.array([1, 2, 3, 4, 1], dtype=np.int32),
+        )
+
+    # Do not merge the reads of nearby rows.
+    with exodus(filename, mode="r", instrument=True, gather_gap=0) as e:
+        num_nodes, local_node_ids = e.get_side_set_node_list(id=4)
+        # Elements 3, 4, 50, and 99.
+        assert e.stats()["datasets"]["connect1"]["bytes_read"] == 4 * 4 * 4
+
+    np.testing.assert_equal(num_nodes, [2, 2, 2, 2, 2])
+    np.testing.assert_equal(
+        local_node_ids, [197, 198, 10, 11, 199, 200, 16, 13, 393, 394],
+    )
+
+
+def test_get_side_set_node_list_multiple_blocks(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=2,
+        numNodes=14,
+        numElems=4,
+        numBlocks=2,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_elem_blk_info(1, "QUAD4", 2, 4, 0)
+        e.put_elem_connectivity(1, np.arange(8).reshape((2, 4)) + 1)
+        e.put_elem_blk_info(2, "TRI", 2, 3, 0)
+        e.put_elem_connectivity(2, np.arange(6).reshape((2, 3)) + 9)
+        e.put_side_set_params(4, 4, 0)
+        e.put_side_set(
+            4,
+            np.array([3, 1, 4, 2], dtype=np.int32),
+            np.array([3, 2, 1, 4], dtype=np.int32),
+        )
+
+    with exodus(filename, mode="r") as e:
+        num_nodes, local_node_ids = e.get_side_set_node_list(id=4)
+
+    np.testing.assert_equal(num_nodes, [2, 2, 2, 2])
+    np.testing.assert_equal(local_node_ids, [11, 9, 2, 3, 12, 13, 8, 5])
+
+
+def test_warning_block_ids(tmpdir):
+    """
+    Only files whose block ids are not their positions trigger a warning.
+    """
+    for ids, warns in [([1, 2], False), ([10, 20], True)]:
+        filename = os.path.join(tmpdir.strpath, "example_%i.e" % ids[0])
+        with exodus(
+            filename,
+            mode="w",
+            title="Example",
+            array_type="numpy",
+            numDims=2,
+            numNodes=8,
+            numElems=2,
+            numBlocks=2,
+            numNodeSets=0,
+            numSideSets=0,
+        ) as e:
+            for _id in ids:
+                e.put_elem_blk_info(_id, "QUAD4", 1, 4, 0)
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            exodus(filename, mode="r").close()
+        assert len(w) == int(warns), ids
+
+
+def test_get_side_set_node_list_element_types(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=60,
+        numElems=4,
+        numBlocks=4,
+        numNodeSets=0,
+        numSideSets=2,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_elem_blk_info(1, "SHELL4", 1, 4, 0)
+        e.put_elem_connectivity(1, np.arange(4).reshape((1, 4)) + 1)
+        e.put_elem_blk_info(2, "TETRA10", 1, 10, 0)
+        e.put_elem_connectivity(2, np.arange(10).reshape((1, 10)) + 11)
+        e.put_elem_blk_info(3, "HEX27", 1, 27, 0)
+        e.put_elem_connectivity(3, np.arange(27).reshape((1, 27)) + 31)
+        e.put_elem_blk_info(4, "HEX", 1, 3, 0)
+        e.put_elem_connectivity(4, np.arange(3).reshape((1, 3)) + 1)
+        e.put_side_set_params(4, 4, 0)
+        e.put_side_set(
+            4,
+            np.array([1, 1, 2, 3], dtype=np.int32),
+            np.array([1, 3, 4, 5], dtype=np.int32),
+        )
+        e.put_side_set_params(5, 1, 0)
+        e.put_side_set(
+            5, np.array([4], dtype=np.int32), np.array([1], dtype=np.int32)
+        )
+
+    with exodus(filename, mode="r") as e:
+        num_nodes, local_node_ids = e.get_side_set_node_list(id=4)
+        # Unknown number of nodes for HEX elements.
+        with pytest.raises(ValueError):
+            e.get_side_set_node_list(id=5)
+
+    np.testing.assert_equal(num_nodes, [4, 2, 6, 9])
+    np.testing.assert_equal(
+        local_node_ids,
+        # Shell face, shell edge, tet and hex face.
+        [1, 2, 3, 4]
+        + [1, 2]
+        + [11, 13, 12, 17, 16, 15]
+        + [31, 34, 33, 32, 42, 41, 40, 39, 52],
+    )
+
+
+def test_get_side_set_node_list_tri_shell(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=9,
+        numElems=2,
+        numBlocks=2,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_elem_blk_info(1, "TRI3", 1, 3, 0)
+        e.put_elem_connectivity(1, np.arange(3).reshape((1, 3)) + 1)
+        e.put_elem_blk_info(2, "TRI6", 1, 6, 0)
+        e.put_elem_connectivity(2, np.arange(6).reshape((1, 6)) + 4)
+        e.put_side_set_params(4, 5, 0)
+        e.put_side_set(
+            4,
+            np.array([1, 1, 1, 2, 2], dtype=np.int32),
+            np.array([1, 2, 5, 2, 4], dtype=np.int32),
+        )
+
+    with exodus(filename, mode="r") as e:
+        num_nodes, local_node_ids = e.get_side_set_node_list(id=4)
+
+    # Two faces and an edge of each triangular shell.
+    np.testing.assert_equal(num_nodes, [3, 3, 2, 6, 3])
+    np.testing.assert_equal(
+        local_node_ids,
+        [1, 2, 3] + [1, 3, 2] + [3, 1] + [4, 6, 5, 9, 8, 7] + [5, 6, 8],
+    )
+
+
 def test_get_coord_3d(tmpdir, io_size):
     filename = os.path.join(tmpdir.strpath, "example.e")
 
@@ -579,6 +827,61 @@ def test_get_elem_connectivity_only_some_indices(tmpdir, io_size):
     assert num_nodes_per_elem == 8
 
 
+def test_plan_gather():
+    # Sorted, deduplicated, and merged if the gap is small enough.
+    runs, positions = _plan_gather([9, 2, 3, 2, 20], 20, 8, 4 * 8)
+    assert runs == [(1, 3), (8, 9), (19, 20)]
+    np.testing.assert_equal(positions, [2, 0, 1, 0, 3])
+    # The 5 rows between 3 and 9 are read as well.
+    runs, positions = _plan_gather([9, 2, 3, 2, 20], 20, 8, 5 * 8)
+    assert runs == [(1, 9), (19, 20)]
+    np.testing.assert_equal(positions, [7, 0, 1, 0, 8])
+    runs, positions = _plan_gather([], 20, 8, 0)
+    assert runs == []
+    assert positions.size == 0
+    with pytest.raises(ValueError):
+        _plan_gather([0, 1], 20, 8, 0)
+    with pytest.raises(ValueError):
+        _plan_gather([21], 20, 8, 0)
+
+
+@pytest.mark.parametrize("gather_gap", [0, 64 * 1024])
+def test_gather_unsorted_indices(tmpdir, io_size, gather_gap):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    connectivity = np.arange(50 * 4).reshape((50, 4)) + 1
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=200,
+        numElems=50,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=0,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_coords(
+            np.arange(200.0), np.arange(200.0) * 2, np.arange(200.0) * 3
+        )
+        e.put_elem_blk_info(1, "QUAD", 50, 4, 0)
+        e.put_elem_connectivity(1, connectivity)
+
+    indices = np.array([40, 3, 3, 199, 1, 100])
+    with exodus(filename, mode="r", gather_gap=gather_gap) as e:
+        x, y, z = e.get_coord(indices)
+        conn, _, _ = e.get_elem_connectivity(1, indices=[50, 2, 2, 17])
+        with pytest.raises(ValueError):
+            e.get_coord([1, 201])
+
+    np.testing.assert_equal(x, indices - 1)
+    np.testing.assert_equal(y, (indices - 1) * 2)
+    np.testing.assert_equal(z, (indices - 1) * 3)
+    np.testing.assert_equal(conn, connectivity[[49, 1, 1, 16]])
+
+
 def test_num_dims_accessor(tmpdir, io_size):
     # 2D
     filename = os.path.join(tmpdir.strpath, "example_2d.e")
@@ -719,3 +1022,485 @@ def test_get_node_variable_names(tmpdir, io_size):
     e.put_node_variable_name("good friend", 1)
 
     assert e.get_node_variable_names() == ["good friend", ""]
+
+
+def test_variable_name_cache(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    e = exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+    )
+    e.set_node_variable_number(2)
+    e.put_node_variable_name("a", 1)
+    e.put_node_variable_name("b", 2)
+    e.set_global_variable_number(2)
+    e.put_global_variable_name("energy", 1)
+    e.put_global_variable_name("residual", 2)
+
+    assert e.get_node_variable_names() == ["a", "b"]
+    assert e.get_global_variable_names() == ["energy", "residual"]
+    # Modifying the returned list must not affect the cache.
+    e.get_node_variable_names().append("c")
+    assert e.get_node_variable_names() == ["a", "b"]
+
+    e.put_node_variable_values("b", 1, np.arange(5))
+    e.put_global_variable_value("residual", 1, 2.0)
+
+    # Renaming invalidates the cache.
+    e.put_node_variable_name("c", 2)
+    assert e.get_node_variable_names() == ["a", "c"]
+    np.testing.assert_equal(e.get_node_variable_values("c", 1), np.arange(5))
+    with pytest.raises(ValueError) as err:
+        e.get_node_variable_values("b", 1)
+    assert err.value.args[0] == "'b' is not in list"
+
+    # As does resetting the number of variables.
+    e.set_element_variable_number(1)
+    e.put_element_variable_name("x", 1)
+    assert e.get_element_variable_names() == ["x"]
+    e.close()
+
+    with exodus(filename, mode="r") as e:
+        assert e.get_node_variable_names() == ["a", "c"]
+        assert e.get_global_variable_names() == ["energy", "residual"]
+        assert e.get_element_variable_names() == ["x"]
+        np.testing.assert_almost_equal(
+            e._f.variables["vals_glo_var"][0, 1], 2.0
+        )
+
+
+def test_get_node_and_element_variable_history(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    values = np.arange(4 * 5, dtype=np.float64).reshape((4, 5))
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=5,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=0,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_elem_blk_info(1, "HEX", 5, 3, 0)
+        e.set_node_variable_number(1)
+        e.put_node_variable_name("u", 1)
+        e.set_element_variable_number(1)
+        e.put_element_variable_name("s", 1)
+        for step in range(1, 5):
+            e.put_time(step, float(step))
+            e.put_node_variable_values("u", step, values[step - 1])
+            e.put_element_variable_values(1, "s", step, -values[step - 1])
+
+    with exodus(filename, mode="r") as e:
+        # Unsorted, with duplicates and gaps.
+        ids = [5, 1, 2, 5, 4]
+        h = e.get_node_variable_history("u", ids)
+        assert h.shape == (4, 5)
+        np.testing.assert_allclose(h, values[:, np.array(ids) - 1])
+
+        h = e.get_node_variable_history("u", [3], steps=(2, 3))
+        np.testing.assert_allclose(h, values[1:3, [2]])
+
+        h = e.get_element_variable_history(1, "s", ids, steps=4)
+        np.testing.assert_allclose(h, -values[3:, np.array(ids) - 1])
+
+        assert e.get_node_variable_history("u", []).shape == (4, 0)
+
+        with pytest.raises(ValueError):
+            e.get_node_variable_history("u", [0])
+        with pytest.raises(ValueError):
+            e.get_node_variable_history("u", [6])
+        with pytest.raises(ValueError):
+            e.get_element_variable_history(1, "s", [1], steps=(1, 5))
+
+
+@pytest.mark.parametrize("compression", [None, ("gzip", 1)])
+def test_mmap(tmpdir, io_size, compression):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=0,
+        io_size=io_size["io_size"],
+        compression=compression,
+    ) as e:
+        e.put_coords(np.arange(5.0), np.arange(5.0) * 2, np.arange(5.0) * 3)
+        e.put_elem_blk_info(1, "HEX", 6, 3, 0)
+        e.put_elem_connectivity(1, np.arange(6 * 3), shift_indices=1)
+        e.set_node_variable_number(1)
+        e.put_node_variable_name("u", 1)
+        e.put_time(1, 1.0)
+        e.put_node_variable_values("u", 1, np.arange(5.0))
+
+    with exodus(filename, mode="r") as e:
+        coords = e.get_coords()
+        conn = e.get_elem_connectivity(1)[0]
+        single = e.get_coord([2, 4])
+        values = e.get_node_variable_values("u", 1)
+
+    with exodus(filename, mode="r", mmap=True) as e:
+        m_coords = e.get_coords()
+        m_conn, num_elems, num_nodes = e.get_elem_connectivity(1)
+        m_single = e.get_coord([2, 4])
+        m_values = e.get_node_variable_values("u", 1)
+        assert (num_elems, num_nodes) == (6, 3)
+        np.testing.assert_equal(
+            e.get_elem_connectivity(1, indices=[2, 5])[0], conn[[1, 4]]
+        )
+
+    # Still valid after closing the file.
+    for _a, _b in zip(coords + single, m_coords + m_single):
+        np.testing.assert_equal(_a, _b)
+    np.testing.assert_equal(conn, m_conn)
+    np.testing.assert_equal(values, m_values)
+
+    # Uncompressed data is memory mapped, the rest is read.
+    assert isinstance(m_coords[0], np.memmap) == (compression is None)
+    assert isinstance(m_conn, np.memmap) == (compression is None)
+    assert not isinstance(m_values, np.memmap)
+    if compression is None:
+        assert not m_conn.flags.writeable
+
+    with pytest.raises(AssertionError):
+        exodus(filename, mode="a", mmap=True)
+
+
+def test_metadata_catalogue(tmpdir, io_size, monkeypatch):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=2,
+        numNodeSets=0,
+        numSideSets=2,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_elem_blk_info(1, "HEX", 3, 3, 0)
+        e.put_side_set_params(4, 2, 0)
+        e.set_node_variable_number(1)
+        e.put_node_variable_name("u", 1)
+        e.put_time(1, 0.1)
+        with e.timestep_writer() as w:
+            w.put_time(2, 0.2)
+            w.put_time(3, 0.3)
+        np.testing.assert_allclose(e.get_times(), [0.1, 0.2, 0.3], rtol=1e-6)
+
+    # Count all reads from the file.
+    reads = []
+    _getitem = h5py.Dataset.__getitem__
+
+    def _counting_getitem(self, *args, **kwargs):
+        reads.append(self.name)
+        return _getitem(self, *args, **kwargs)
+
+    with exodus(filename, mode="a") as e:
+        monkeypatch.setattr(h5py.Dataset, "__getitem__", _counting_getitem)
+        assert e._catalogue_index["ss_prop1"] == {4: 0, -1: 1}
+        for _ in range(3):
+            assert e.get_side_set_ids() == [4, -1]
+            assert e.get_node_variable_names() == ["u"]
+            times = e.get_times()
+            assert times.dtype == io_size["f_dtype"]
+            np.testing.assert_allclose(times, [0.1, 0.2, 0.3], rtol=1e-6)
+        # Writers use and update the catalogue.
+        e.put_elem_blk_info(2, "HEX", 3, 3, 0)
+        e.put_side_set_params(7, 2, 0)
+        e.put_time(4, 0.4)
+        assert reads == []
+        monkeypatch.undo()
+
+        assert e.get_side_set_ids() == [4, 7]
+        assert all(type(_i) is int for _i in e.get_side_set_ids())
+        # The id -> index lookup tables are updated as well.
+        assert e._catalogue_index == {
+            "eb_prop1": {1: 0, 2: 1},
+            "ss_prop1": {4: 0, 7: 1},
+        }
+        np.testing.assert_allclose(
+            e.get_times(), [0.1, 0.2, 0.3, 0.4], rtol=1e-6
+        )
+
+    with exodus(filename, mode="r") as e:
+        assert e.get_side_set_ids() == [4, 7]
+        assert e._f.variables["eb_prop1"][:].tolist() == [1, 2]
+        np.testing.assert_allclose(
+            e.get_times(), [0.1, 0.2, 0.3, 0.4], rtol=1e-6
+        )
+
+
+def test_lazy(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=0,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_coords(np.arange(5.0), np.arange(5.0) * 2, np.arange(5.0) * 3)
+        e.put_elem_blk_info(1, "HEX", 6, 3, 0)
+        e.put_elem_connectivity(1, np.arange(6 * 3), shift_indices=1)
+        e.set_node_variable_number(1)
+        e.put_node_variable_name("u", 1)
+        e.set_element_variable_number(1)
+        e.put_element_variable_name("v", 1)
+        for step in range(1, 3):
+            e.put_time(step, float(step))
+            e.put_node_variable_values("u", step, np.arange(5.0) * step)
+            e.put_element_variable_values(1, "v", step, np.arange(6.0) + step)
+
+    with exodus(filename, mode="r", lazy=True, instrument=True) as e:
+        x, y, z = e.get_coords()
+        conn, num_elems, num_nodes = e.get_elem_connectivity(1)
+        u = e.get_node_variable_values("u", 2)
+        v = e.get_element_variable_values(1, "v", 2)
+        # Nothing has been read so far.
+        big = ["coordx", "coordy", "connect1", "vals_nod_var1"]
+        big.append("vals_elem_var1eb1")
+        assert not set(big) & set(e.stats()["datasets"])
+
+        assert isinstance(x, LazyArray)
+        assert x.shape == (5,)
+        assert x.dtype == io_size["f_dtype"]
+        assert len(x) == 5
+        assert conn.shape == (6, 3) and conn.ndim == 2 and conn.size == 18
+        assert (num_elems, num_nodes) == (6, 3)
+        assert conn.dtype == np.int32
+        assert u.shape == (5,)
+        assert v.shape == (6,)
+
+        np.testing.assert_equal(y[1:3], [2.0, 4.0])
+        np.testing.assert_equal(conn[1], [4, 5, 6])
+        np.testing.assert_equal(conn[2:4, 1], [8, 11])
+        np.testing.assert_equal(u[-2:], [6.0, 8.0])
+        np.testing.assert_equal(v[...], np.arange(6.0) + 2)
+        # Only the selected hyperslabs have been read.
+        datasets = e.stats()["datasets"]
+        assert datasets["coordy"]["bytes_read"] == 2 * x.dtype.itemsize
+        assert datasets["connect1"]["bytes_read"] == 5 * 4
+        assert "coordx" not in datasets
+
+        np.testing.assert_equal(np.asarray(z), np.arange(5.0) * 3)
+        np.testing.assert_equal(np.asarray(u, dtype=np.float32), u[:])
+        assert np.asarray(u).dtype == io_size["f_dtype"]
+        assert "lazy array" in repr(conn)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"mmap": True}, {"instrument": True}, {"lazy": True}]
+)
+def test_read_into_out(tmpdir, io_size, kwargs):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_coords(np.arange(5.0), np.arange(5.0) * 2, np.arange(5.0) * 3)
+        e.put_elem_blk_info(1, "HEX", 6, 3, 0)
+        e.put_elem_connectivity(1, np.arange(6 * 3), shift_indices=1)
+        e.set_node_variable_number(1)
+        e.put_node_variable_name("u", 1)
+        e.set_element_variable_number(1)
+        e.put_element_variable_name("v", 1)
+        for step in range(1, 4):
+            e.put_time(step, float(step))
+            e.put_node_variable_values("u", step, np.arange(5.0) * step)
+            e.put_element_variable_values(1, "v", step, np.arange(6.0) + step)
+        e.put_side_set_params(4, 3, 0)
+        e.put_side_set(
+            4,
+            np.array([1, 2, 3], dtype=np.int32),
+            np.array([4, 5, 6], dtype=np.int32),
+        )
+
+    with exodus(filename, mode="r", **kwargs) as e:
+        # One buffer for all steps, converted to single precision.
+        u = np.empty(5, dtype=np.float32)
+        v = np.empty(6, dtype=np.float32)
+        for step in range(1, 4):
+            assert e.get_node_variable_values("u", step, out=u) is u
+            np.testing.assert_equal(u, np.arange(5.0) * step)
+            assert e.get_element_variable_values(1, "v", step, out=v) is v
+            np.testing.assert_equal(v, np.arange(6.0) + step)
+
+        coords = np.empty((3, 5))
+        x, y, z = e.get_coords(out=coords)
+        np.testing.assert_equal(
+            coords, [np.arange(5.0) * _i for _i in [1, 2, 3]]
+        )
+        assert x.base is coords
+
+        conn = np.empty((6, 3), dtype=np.int64)
+        assert e.get_elem_connectivity(1, out=conn)[0] is conn
+        np.testing.assert_equal(conn, np.arange(18).reshape((6, 3)) + 1)
+        conn = np.empty((2, 3), dtype=np.int64)
+        e.get_elem_connectivity(1, indices=[4, 2], out=conn)
+        np.testing.assert_equal(conn, [[10, 11, 12], [4, 5, 6]])
+
+        elems, sides = np.empty(3, np.int64), np.empty(3, np.int64)
+        e.get_side_set(4, out=(elems, sides))
+        np.testing.assert_equal(elems, [1, 2, 3])
+        np.testing.assert_equal(sides, [4, 5, 6])
+
+        with pytest.raises(ValueError):
+            e.get_node_variable_values("u", 1, out=np.empty(4))
+        with pytest.raises(ValueError):
+            e.get_node_variable_values("u", 1, out=np.empty(10)[::2])
+        with pytest.raises(ValueError):
+            e.get_coords(out=np.empty((2, 5)))
+
+        if "instrument" in kwargs:
+            stats = e.stats()["datasets"]
+            assert stats["vals_nod_var1"]["reads"] == 3
+            assert stats["vals_nod_var1"]["bytes_read"] == 3 * 5 * 4
+
+
+def test_iterators(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    u = np.arange(10 * 100, dtype=np.float64).reshape((10, 100))
+    connectivity = np.arange(6 * 3).reshape((6, 3)) + 1
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=100,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=0,
+        io_size=io_size["io_size"],
+        expected_steps=4,
+    ) as e:
+        e.put_elem_blk_info(1, "HEX", 6, 3, 0)
+        e.put_elem_connectivity(1, connectivity)
+        e.set_node_variable_number(1)
+        e.put_node_variable_name("u", 1)
+        e.set_element_variable_number(1)
+        e.put_element_variable_name("v", 1)
+        for step in range(1, 11):
+            e.put_time(step, float(step))
+            e.put_node_variable_values("u", step, u[step - 1])
+            e.put_element_variable_values(1, "v", step, u[step - 1, :6])
+
+    with exodus(filename, mode="r") as e:
+        assert e._f.variables["vals_nod_var1"].chunks == (4, 100)
+        itemsize = e._f.variables["vals_nod_var1"].dtype.itemsize
+
+        # Everything fits into the default budget.
+        blocks = list(e.iter_node_variable_values("u"))
+        assert len(blocks) == 1
+        assert blocks[0][0] == range(1, 11)
+        assert blocks[0][1] == range(1, 101)
+        np.testing.assert_equal(blocks[0][2], u)
+
+        # Blocks of whole chunks in time but not across nodes as a single
+        # chunk does not fit.
+        budget = 4 * 50 * itemsize
+        blocks = list(e.iter_node_variable_values("u", memory_budget=budget))
+        assert [(_s, _n) for _s, _n, _ in blocks] == [
+            (range(1, 5), range(1, 51)),
+            (range(1, 5), range(51, 101)),
+            (range(5, 9), range(1, 51)),
+            (range(5, 9), range(51, 101)),
+            (range(9, 11), range(1, 51)),
+            (range(9, 11), range(51, 101)),
+        ]
+        for steps, nodes, values in blocks:
+            assert values.nbytes <= budget
+            np.testing.assert_equal(
+                values,
+                u[
+                    steps.start - 1 : steps.stop - 1,  # NOQA
+                    nodes.start - 1 : nodes.stop - 1,  # NOQA
+                ],
+            )
+
+        # Blocks end at chunk boundaries.
+        blocks = list(
+            e.iter_node_variable_values(
+                "u", steps=(3, 10), memory_budget=budget
+            )
+        )
+        assert [_b[0] for _b in blocks[::2]] == [
+            range(3, 5),
+            range(5, 9),
+            range(9, 11),
+        ]
+        # Requests smaller than a chunk are honored.
+        blocks = list(e.iter_node_variable_values("u", steps=7, node_chunk=60))
+        assert [(_s, _n) for _s, _n, _ in blocks] == [
+            (range(7, 8), range(1, 61)),
+            (range(7, 8), range(61, 101)),
+        ]
+
+        budget = 2 * 6 * itemsize
+        v = np.zeros((10, 6))
+        for steps, elems, values in e.iter_element_variable_values(
+            1, "v", memory_budget=budget
+        ):
+            assert values.nbytes <= budget
+            v[
+                steps.start - 1 : steps.stop - 1,  # NOQA
+                elems.start - 1 : elems.stop - 1,  # NOQA
+            ] = values
+        np.testing.assert_equal(v, u[:, :6])
+
+        blocks = list(e.iter_elem_connectivity(1, chunk_rows=4))
+        assert [_b[0] for _b in blocks] == [range(1, 5), range(5, 7)]
+        np.testing.assert_equal(
+            np.concatenate([_b[1] for _b in blocks]), connectivity
+        )
+        blocks = list(e.iter_elem_connectivity(1))
+        assert len(blocks) == 1
+
+        with pytest.raises(ValueError):
+            e.iter_node_variable_values("u", steps=(1, 11))
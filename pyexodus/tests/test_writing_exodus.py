@@ -8,12 +8,16 @@
 """
 import os
 import platform
+import subprocess
+import sys
 
 import h5netcdf
 import numpy as np
 import pytest
 
+import pyexodus
 from pyexodus import exodus
+from pyexodus.core import _plan_chunks
 
 _p = [
     {"io_size": 4, "word_size": 4, "f_dtype": np.float32},
@@ -189,6 +193,35 @@ def test_initialization(tmpdir, io_size):
             assert a.shape == e["shape"], key
 
 
+@pytest.mark.parametrize("compression_workers", [0, 2])
+def test_put_coords_broadcast(tmpdir, compression_workers):
+    """
+    Scalars are broadcast, arrays with the wrong length are rejected.
+    """
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=2,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=0,
+        compression=("gzip", 1),
+        compression_workers=compression_workers,
+    ) as e:
+        e.put_coords(np.arange(5.0), np.arange(5.0) * 2, 0.0)
+        with pytest.raises(TypeError):
+            e.put_coords(np.arange(5.0), np.arange(5.0), np.arange(3.0))
+
+    with exodus(filename, mode="r") as e:
+        np.testing.assert_equal(e.get_coords()[2], np.zeros(5))
+
+
 def test_put_coords(tmpdir, io_size):
     """
     Tests the put_coords() method.
@@ -424,6 +457,162 @@ def test_put_elem_connectivity_indices_shift(tmpdir, io_size):
             assert a.shape == e["shape"], key
 
 
+def test_put_elem_connectivity_in_chunks(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    connectivity = np.arange(6 * 3, dtype=np.int64).reshape((6, 3))
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_elem_blk_info(1, "HEX", 6, 3, 0)
+        # Less than two elements per chunk.
+        e.put_elem_connectivity(
+            1, connectivity, shift_indices=1, chunk_size_in_mb=40.0 / 1024 ** 2
+        )
+        with pytest.raises(ValueError) as err:
+            e.put_elem_connectivity(1, connectivity + 2 ** 31)
+        assert "int64=True" in str(err.value)
+
+    with h5netcdf.File(filename, mode="r") as f:
+        assert f.variables["connect1"].dtype == np.int32
+        np.testing.assert_equal(f.variables["connect1"][:], connectivity + 1)
+
+
+@pytest.mark.parametrize("shift_indices", [0, 1])
+def test_put_elem_connectivity_from_memmap(tmpdir, io_size, shift_indices):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    connectivity = np.memmap(
+        os.path.join(tmpdir.strpath, "connectivity.bin"),
+        dtype=np.int64,
+        mode="w+",
+        shape=(50000, 8),
+    )
+    connectivity[:] = np.arange(400000).reshape((50000, 8))
+    connectivity.flush()
+    connectivity = np.memmap(
+        os.path.join(tmpdir.strpath, "connectivity.bin"),
+        dtype=np.int64,
+        mode="r",
+        shape=(50000, 8),
+    )
+
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=400000,
+        numElems=50000,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=0,
+        io_size=io_size["io_size"],
+        compression=("gzip", 1),
+    ) as e:
+        e.put_elem_blk_info(1, "HEX", 50000, 8, 0)
+
+        # Record the writes.
+        writes = []
+        _write_rows = e._write_rows
+
+        def _w(var_name, start, values):
+            writes.append((start, len(values), values))
+            _write_rows(var_name, start, values)
+
+        e._write_rows = _w
+        e.put_elem_connectivity(
+            1,
+            memoryview(connectivity),
+            shift_indices=shift_indices,
+            chunk_size_in_mb=0.5,
+        )
+        chunk_rows = e._f.variables["connect1"]._h5ds.chunks[0]
+
+    # All writes are aligned to the chunks.
+    assert len(writes) > 1
+    for start, length, _ in writes:
+        assert start % chunk_rows == 0
+        assert length % chunk_rows == 0 or start + length == 50000
+    # int64 -> int32: All pieces are converted in the same buffer.
+    assert np.shares_memory(writes[0][2], writes[1][2])
+
+    with h5netcdf.File(filename, mode="r") as f:
+        np.testing.assert_equal(
+            f.variables["connect1"][:], connectivity + shift_indices
+        )
+
+
+def test_int64(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    large = 2 ** 40
+    e = exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=2,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+        int64=True,
+    )
+    e.put_elem_blk_info(1, "HEX", 3, 3, 0)
+    e.put_elem_connectivity(1, np.arange(9) + large, chunk_size_in_mb=0)
+    e.put_side_set_params(large, 2, 0)
+    e.put_side_set(large, np.array([1, large]), np.array([2, 3]))
+    e.close()
+
+    # Appending respects the integer size of the file.
+    with exodus(filename, mode="a") as e:
+        e.put_elem_blk_info(2, "HEX", 3, 3, 0)
+
+    with h5netcdf.File(filename, mode="r") as f:
+        assert f.attrs["int64_status"] == 0x1C00
+        for name in [
+            "connect1",
+            "connect2",
+            "elem_ss1",
+            "side_ss1",
+            "eb_prop1",
+            "ss_prop1",
+        ]:
+            assert f.variables[name].dtype == np.int64, name
+        np.testing.assert_equal(
+            f.variables["connect1"][:], (np.arange(9) + large).reshape(3, 3)
+        )
+        np.testing.assert_equal(f.variables["eb_prop1"][:], [1, 2])
+        np.testing.assert_equal(f.variables["ss_prop1"][:], [large])
+        np.testing.assert_equal(f.variables["elem_ss1"][:], [1, large])
+
+    with pytest.raises(ValueError):
+        exodus(
+            os.path.join(tmpdir.strpath, "other.e"),
+            mode="w",
+            numDims=3,
+            numNodes=2 ** 31,
+            numElems=6,
+            numBlocks=1,
+            numNodeSets=0,
+            numSideSets=0,
+        )
+
+
 def test_put_time(tmpdir, io_size):
     filename = os.path.join(tmpdir.strpath, "example.e")
 
@@ -983,6 +1172,469 @@ def test_put_node_variable_values(tmpdir, io_size):
             assert a.shape == e["shape"], key
 
 
+def test_put_node_variable_values_batch(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    e = exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+    )
+    e.set_node_variable_number(2)
+    e.put_node_variable_name("a", 1)
+    e.put_node_variable_name("b", 2)
+
+    # A single variable.
+    e.put_node_variable_values_batch("a", 1, np.arange(15).reshape((3, 5)))
+    # Multiple variables at once, starting at a later step.
+    e.put_node_variable_values_batch(
+        ["b", "a"],
+        2,
+        [np.ones((3, 5)) * 2, np.arange(15).reshape((3, 5)) + 100],
+    )
+    e.close()
+
+    with h5netcdf.File(filename, mode="r") as f:
+        assert f.variables["vals_nod_var1"].shape == (4, 5)
+        np.testing.assert_equal(
+            f.variables["vals_nod_var1"][:],
+            np.concatenate(
+                [
+                    np.arange(5)[np.newaxis, :],
+                    np.arange(15).reshape((3, 5)) + 100,
+                ]
+            ),
+        )
+        np.testing.assert_equal(
+            f.variables["vals_nod_var2"][:],
+            np.concatenate([np.zeros((1, 5)), np.ones((3, 5)) * 2]),
+        )
+
+    with exodus(filename, mode="a") as e:
+        # Wrong shape.
+        with pytest.raises(AssertionError):
+            e.put_node_variable_values_batch("a", 1, np.ones((2, 4)))
+        # Invalid name.
+        with pytest.raises(ValueError):
+            e.put_node_variable_values_batch("c", 1, np.ones((2, 5)))
+
+
+def test_timestep_writer(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    e = exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+    )
+    e.put_elem_blk_info(1, "HEX", 6, 8, 0)
+    e.set_node_variable_number(2)
+    e.put_node_variable_name("a", 1)
+    e.put_node_variable_name("b", 2)
+    e.set_element_variable_number(1)
+    e.put_element_variable_name("s", 1)
+    e.set_global_variable_number(2)
+    e.put_global_variable_name("energy", 1)
+    e.put_global_variable_name("residual", 2)
+
+    with e.timestep_writer(buffer_steps=4) as w:
+        for step in range(1, 11):
+            w.put_time(step, step * 0.5)
+            w.put_node_variable_values("a", step, np.arange(5) + step)
+            # Only every second step for this one.
+            if step % 2:
+                w.put_node_variable_values("b", step, np.ones(5) * step)
+            w.put_element_variable_values(1, "s", step, np.arange(6) * step)
+            w.put_global_variable_value("energy", step, step * 2.0)
+            if step == 3:
+                w.put_global_variable_value("residual", step, 7.0)
+            # Nothing is written before the buffer is full.
+            if step <= 4:
+                assert e._f._current_dim_sizes["time_step"] == 0
+
+        # Names are checked right away.
+        with pytest.raises(ValueError):
+            w.put_node_variable_values("c", 11, np.ones(5))
+    e.close()
+
+    steps = np.arange(1, 11)
+    with h5netcdf.File(filename, mode="r") as f:
+        np.testing.assert_allclose(f.variables["time_whole"][:], steps * 0.5)
+        np.testing.assert_equal(
+            f.variables["vals_nod_var1"][:],
+            np.arange(5)[np.newaxis, :] + steps[:, np.newaxis],
+        )
+        b = np.ones((10, 5)) * steps[:, np.newaxis]
+        b[1::2] = 0.0
+        np.testing.assert_equal(f.variables["vals_nod_var2"][:], b)
+        np.testing.assert_equal(
+            f.variables["vals_elem_var1eb1"][:],
+            np.arange(6)[np.newaxis, :] * steps[:, np.newaxis],
+        )
+        assert f.variables["vals_elem_var1eb1"].chunks == (4, 6)
+        glo = np.zeros((10, 2))
+        glo[:, 0] = steps * 2.0
+        glo[2, 1] = 7.0
+        np.testing.assert_allclose(f.variables["vals_glo_var"][:], glo)
+
+
+def test_background_writer(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    e = exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+        write_queue_size=2,
+    )
+    e.put_elem_blk_info(1, "HEX", 6, 8, 0)
+    e.set_node_variable_number(1)
+    e.put_node_variable_name("a", 1)
+    e.set_element_variable_number(1)
+    e.put_element_variable_name("s", 1)
+    e.set_global_variable_number(1)
+    e.put_global_variable_name("energy", 1)
+
+    for step in range(1, 21):
+        e.put_time(step, step * 0.5)
+        e.put_node_variable_values("a", step, np.arange(5) + step)
+        e.put_element_variable_values(1, "s", step, np.arange(6) * step)
+        e.put_global_variable_value("energy", step, step * 2.0)
+    e.put_node_variable_values_batch("a", 21, np.arange(10).reshape((2, 5)))
+
+    # Reading waits for all pending writes.
+    np.testing.assert_equal(
+        e.get_node_variable_values("a", 20), np.arange(5) + 20
+    )
+    e.close()
+
+    steps = np.arange(1, 21)
+    with h5netcdf.File(filename, mode="r") as f:
+        np.testing.assert_allclose(f.variables["time_whole"][:20], steps * 0.5)
+        np.testing.assert_equal(
+            f.variables["vals_nod_var1"][:],
+            np.concatenate(
+                [
+                    np.arange(5)[np.newaxis, :] + steps[:, np.newaxis],
+                    np.arange(10).reshape((2, 5)),
+                ]
+            ),
+        )
+        np.testing.assert_equal(
+            f.variables["vals_elem_var1eb1"][:20],
+            np.arange(6)[np.newaxis, :] * steps[:, np.newaxis],
+        )
+        np.testing.assert_allclose(
+            f.variables["vals_glo_var"][:20, 0], steps * 2.0
+        )
+
+
+def test_background_writer_errors(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    e = exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+        write_queue_size=4,
+    )
+    e.set_node_variable_number(1)
+    e.put_node_variable_name("a", 1)
+
+    # Does not raise right away but with the next call.
+    e.put_node_variable_values("b", 1, np.arange(5))
+    with pytest.raises(ValueError) as err:
+        e.get_node_variable_names()
+    assert err.value.args[0] == "'b' is not in list"
+
+    # Afterwards everything works again.
+    e.put_node_variable_values("a", 1, np.arange(5))
+    assert e.get_node_variable_names() == ["a"]
+
+    # Or raises on close.
+    e.put_node_variable_values("b", 2, np.arange(5))
+    with pytest.raises(ValueError) as err:
+        e.close()
+    assert err.value.args[0] == "'b' is not in list"
+
+    with exodus(filename, mode="r") as e:
+        np.testing.assert_equal(
+            e.get_node_variable_values("a", 1), np.arange(5)
+        )
+
+
+def test_time_dimension_growth(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    e = exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+    )
+    e.set_node_variable_number(1)
+    e.put_node_variable_name("a", 1)
+
+    sizes = []
+    for step in range(1, 6):
+        e.put_time(step, step)
+        e.put_node_variable_values("a", step, np.arange(5) * step)
+        sizes.append(e._f._current_dim_sizes["time_step"])
+    # The time dimension grows geometrically.
+    assert sizes == [1, 2, 4, 4, 8]
+
+    # Reserved steps cannot be read.
+    np.testing.assert_equal(
+        e.get_node_variable_values("a", 5), np.arange(5) * 5
+    )
+    with pytest.raises(ValueError) as err:
+        e.get_node_variable_values("a", 6)
+    assert err.value.args[0] == "Step must be 0 < step <= 5."
+    e.close()
+
+    # And they are trimmed when closing the file.
+    with h5netcdf.File(filename, mode="r") as f:
+        np.testing.assert_equal(f.variables["time_whole"][:], np.arange(1, 6))
+        assert f.variables["vals_nod_var1"].shape == (5, 5)
+
+
+def test_expected_steps(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    e = exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+        expected_steps=10,
+    )
+    e.set_node_variable_number(1)
+    e.put_node_variable_name("a", 1)
+    e.set_global_variable_number(2)
+    e.put_global_variable_name("energy", 1)
+
+    # Chunks are sized for the expected number of steps.
+    assert e._f.variables["time_whole"].chunks == (10,)
+    assert e._f.variables["vals_nod_var1"].chunks == (10, 5)
+    assert e._f.variables["vals_glo_var"].chunks == (10, 2)
+
+    for step in range(1, 4):
+        e.put_time(step, step)
+        e.put_node_variable_values("a", step, np.arange(5) * step)
+        # The first step reserves all expected steps.
+        assert e._f._current_dim_sizes["time_step"] == 10
+    e.close()
+
+    with h5netcdf.File(filename, mode="r") as f:
+        np.testing.assert_equal(f.variables["time_whole"][:], [1, 2, 3])
+        assert f.variables["vals_nod_var1"].shape == (3, 5)
+        assert f.variables["vals_glo_var"].shape == (3, 2)
+
+    # Writing more than the expected steps works as well.
+    with exodus(filename, mode="a", expected_steps=5) as e:
+        e.put_time(20, 20.0)
+        assert e._f._current_dim_sizes["time_step"] == 20
+    with h5netcdf.File(filename, mode="r") as f:
+        assert f.variables["time_whole"].shape == (20,)
+
+
+# Writes two steps with space for 100 steps and exits without closing the
+# file.
+_UNCLOSED_WRITER = """
+import os
+import sys
+import numpy as np
+from pyexodus import exodus
+
+e = exodus(
+    sys.argv[1], mode="w", title="Example", array_type="numpy", numDims=3,
+    numNodes=5, numElems=6, numBlocks=1, numNodeSets=0, numSideSets=0,
+    expected_steps=100,
+)
+e.put_elem_blk_info(1, "HEX", 6, 3, 0)
+e.set_node_variable_number(1)
+e.put_node_variable_name("u", 1)
+e.set_element_variable_number(1)
+e.put_element_variable_name("v", 1)
+for step in [1, 2]:
+    e.put_time(step, float(step))
+    e.put_node_variable_values("u", step, step * np.ones(5))
+    e.put_element_variable_values(1, "v", step, step * np.ones(6))
+# Everything written so far is on disk, then die without closing.
+e._f.flush()
+e._f._h5file.flush()
+os._exit(0)
+"""
+
+
+def test_expected_steps_unclosed_file(tmpdir):
+    """
+    Reserved steps must not show up if the writer dies before closing.
+    """
+    filename = os.path.join(tmpdir.strpath, "example.e")
+    subprocess.check_call(
+        [sys.executable, "-c", _UNCLOSED_WRITER, filename],
+        env=_subprocess_env(),
+    )
+
+    with exodus(filename, mode="r") as e:
+        np.testing.assert_equal(e.get_times(), [1.0, 2.0])
+        np.testing.assert_equal(
+            e.get_node_variable_values("u", 2), np.ones(5) * 2
+        )
+        for get in [
+            lambda: e.get_node_variable_values("u", 3),
+            lambda: e.get_element_variable_values(1, "v", 3),
+        ]:
+            with pytest.raises(ValueError) as err:
+                get()
+            assert err.value.args[0] == "Step must be 0 < step <= 2."
+        # The result variables still have the reserved steps.
+        assert e._f.variables["vals_nod_var1"].shape == (100, 5)
+        assert e.get_node_variable_history("u", [1]).shape == (2, 1)
+
+    # Appending continues after the written steps and trims the rest.
+    with exodus(filename, mode="a") as e:
+        e.put_time(3, 3.0)
+        e.put_node_variable_values("u", 3, np.ones(5) * 3)
+    with exodus(filename, mode="r") as e:
+        np.testing.assert_equal(e.get_times(), [1.0, 2.0, 3.0])
+        assert e._f.variables["vals_nod_var1"].shape == (3, 5)
+
+
+def test_plan_chunks():
+    mb = 1024 ** 2
+    # One million nodes, 1000 steps, 8 byte values.
+    assert _plan_chunks("snapshot", 1000, 10 ** 6, 8) == (1, 131072)
+    assert _plan_chunks("history", 1000, 10 ** 6, 8) == (1000, 131)
+    assert _plan_chunks("balanced", 1000, 10 ** 6, 8) == (32, 4096)
+    # Balanced differs from history for the default number of steps.
+    assert _plan_chunks("history", 128, 10 ** 6, 8) == (128, 1024)
+    assert _plan_chunks("balanced", 128, 10 ** 6, 8) == (11, 11915)
+    assert _plan_chunks("balanced", 300, 10 ** 6, 4) == (17, 15420)
+    for layout in ["snapshot", "history", "balanced"]:
+        steps, columns = _plan_chunks(layout, 1000, 10 ** 6, 8)
+        assert steps * columns * 8 <= mb
+
+    # Never larger than the variable.
+    assert _plan_chunks("history", 10, 5, 8) == (10, 5)
+    assert _plan_chunks("balanced", 10, 5, 4) == (10, 5)
+    # Small variables get all steps in a single chunk.
+    assert _plan_chunks("snapshot", 100, 5, 8) == (100, 5)
+
+    with pytest.raises(ValueError):
+        _plan_chunks("random", 10, 5, 8)
+
+
+def test_chunk_layout(tmpdir, io_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    itemsize = np.dtype(io_size["f_dtype"]).itemsize
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=100000,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+        expected_steps=50,
+        chunk_layout="history",
+    ) as e:
+        e.set_node_variable_number(2)
+        e.put_node_variable_name("a", 1)
+        e.put_node_variable_values_batch("a", 1, np.ones((3, 100000)))
+        assert e._f.variables["vals_nod_var1"].chunks == _plan_chunks(
+            "history", 50, 100000, itemsize
+        )
+
+    with pytest.raises(ValueError):
+        exodus(
+            os.path.join(tmpdir.strpath, "other.e"),
+            mode="w",
+            numDims=3,
+            numNodes=5,
+            numElems=6,
+            numBlocks=1,
+            numNodeSets=0,
+            numSideSets=0,
+            chunk_layout="random",
+        )
+
+    # Per variable.
+    filename = os.path.join(tmpdir.strpath, "example_2.e")
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=100000,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+        chunk_layout={"vals_nod_var2": "snapshot"},
+    ) as e:
+        e.set_node_variable_number(2)
+        # Default chunking.
+        assert e._f.variables["vals_nod_var1"].chunks[0] > 2
+        assert e._f.variables["vals_nod_var2"].chunks == _plan_chunks(
+            "snapshot", 128, 100000, itemsize
+        )
+
+
 def test_put_side_set_params(tmpdir, io_size):
     filename = os.path.join(tmpdir.strpath, "example.e")
 
@@ -1873,6 +2525,122 @@ def test_compression(tmpdir, io_size):
             assert ds.chunks, ds
 
 
+@pytest.mark.parametrize(
+    "compression, filter_id, shuffle",
+    [
+        (("gzip", 2), "gzip", True),
+        (("lzf", None), "lzf", True),
+        (("zstd", 5), "32015", True),
+        (("lz4", None), "32004", True),
+        (("blosc", 5), "32001", False),
+        (("blosc:zstd", {"clevel": 3, "shuffle": "bit"}), "32001", False),
+        # Numeric filter ids are passed on to h5py unchanged.
+        ((32015, (3,)), "32015", False),
+    ],
+)
+def test_compression_filters(tmpdir, io_size, compression, filter_id, shuffle):
+    if filter_id.isdigit():
+        pytest.importorskip("hdf5plugin")
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    values = np.linspace(0, 1, 500).reshape((5, 100))
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=100,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=0,
+        compression=compression,
+        io_size=io_size["io_size"],
+    ) as e:
+        e.put_coords(values[0], values[1], values[2])
+        e.set_node_variable_number(1)
+        e.put_node_variable_name("a", 1)
+        e.put_node_variable_values_batch("a", 1, values)
+
+    with exodus(filename, mode="r") as e:
+        np.testing.assert_allclose(
+            e.get_node_variable_values("a", 3), values[2], rtol=1e-6
+        )
+        np.testing.assert_allclose(e.get_coords()[1], values[1], rtol=1e-6)
+
+        for name in ["coordx", "vals_nod_var1"]:
+            ds = e._f.variables[name]._h5ds
+            assert ds.chunks, name
+            assert filter_id in ds._filters, name
+        # Only the results are shuffled.
+        assert not e._f.variables["coordx"]._h5ds.shuffle
+        assert e._f.variables["vals_nod_var1"]._h5ds.shuffle is shuffle
+
+
+def test_parallel_compression(tmpdir, io_size):
+    """
+    Parallel compression must produce the same data as HDF5's compression.
+    """
+    num_nodes = 10000
+    num_elems = 3000
+    rng = np.random.RandomState(12345)
+    coords = [rng.rand(num_nodes) for _ in range(3)]
+    connectivity = rng.randint(0, num_nodes, size=(num_elems, 8))
+    node_values = rng.rand(30, num_nodes)
+    elem_values = rng.rand(num_elems)
+
+    filenames = []
+    for workers in [0, 4]:
+        filename = os.path.join(tmpdir.strpath, "example_%i.e" % workers)
+        filenames.append(filename)
+        with exodus(
+            filename,
+            mode="w",
+            title="Example",
+            array_type="numpy",
+            numDims=3,
+            numNodes=num_nodes,
+            numElems=num_elems,
+            numBlocks=1,
+            numNodeSets=0,
+            numSideSets=0,
+            io_size=io_size["io_size"],
+            compression=("gzip", 4),
+            compression_workers=workers,
+        ) as e:
+            e.put_coords(*coords)
+            e.put_elem_blk_info(1, "HEX", num_elems, 8, 0)
+            e.put_elem_connectivity(1, connectivity, shift_indices=1)
+            e.set_node_variable_number(1)
+            e.put_node_variable_name("a", 1)
+            e.put_node_variable_values("a", 1, node_values[0])
+            e.put_node_variable_values_batch("a", 2, node_values[1:])
+            e.set_element_variable_number(1)
+            e.put_element_variable_name("s", 1)
+            e.put_element_variable_values(1, "s", 1, elem_values)
+            if workers:
+                assert e._direct_chunk_filters["coordx"] == (False, 4)
+                assert e._direct_chunk_filters["vals_nod_var1"] == (True, 4)
+
+    with h5netcdf.File(filenames[0], mode="r") as f1, h5netcdf.File(
+        filenames[1], mode="r"
+    ) as f2:
+        assert sorted(f1.variables) == sorted(f2.variables)
+        for name in f1.variables:
+            v1, v2 = f1.variables[name], f2.variables[name]
+            assert v1.dtype == v2.dtype, name
+            assert v1.chunks == v2.chunks, name
+            assert v2.compression == "gzip", name
+            np.testing.assert_equal(v1[:], v2[:], err_msg=name)
+
+        np.testing.assert_equal(f2.variables["connect1"][:], connectivity + 1)
+        np.testing.assert_allclose(
+            f2.variables["vals_nod_var1"][:],
+            node_values.astype(io_size["f_dtype"]),
+        )
+
+
 def test_init_multiple_element_blocks(tmpdir, io_size):
     filename = os.path.join(tmpdir.strpath, "example.e")
 
@@ -2098,3 +2866,250 @@ def test_get_elem_type_for_block(tmpdir, io_size):
         with pytest.raises(ValueError) as err:
             e.get_elem_type_for_block(2)
         assert err.value.args[0] == "No element block with id 2 in file."
+
+
+@pytest.mark.parametrize("compression_workers", [0, 2])
+def test_instrument(tmpdir, io_size, compression_workers):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    events = []
+    with exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+        compression=("gzip", 1),
+        compression_workers=compression_workers,
+        instrument=events.append,
+    ) as e:
+        e.put_coords(np.arange(5.0), np.arange(5.0), np.arange(5.0))
+        e.set_node_variable_number(1)
+        e.put_node_variable_name("u", 1)
+        for step in range(1, 4):
+            e.put_time(step, float(step))
+            e.put_node_variable_values("u", step, np.ones(5) * step)
+        e.get_node_variable_values("u", 2)
+        stats = e.stats()
+
+    itemsize = np.dtype(io_size["f_dtype"]).itemsize
+
+    assert stats["methods"]["put_time"]["calls"] == 3
+    assert stats["methods"]["put_node_variable_values"]["calls"] == 3
+    assert stats["methods"]["put_coords"]["calls"] == 1
+    assert stats["methods"]["put_time"]["time"] > 0
+    assert "stats" not in stats["methods"]
+
+    u = stats["datasets"]["vals_nod_var1"]
+    assert u["writes"] == 3
+    assert u["reads"] == 1
+    assert u["bytes_read"] == 5 * itemsize
+    assert u["time"] > 0
+    assert stats["datasets"]["coordx"]["bytes_written"] == 5 * 8
+    assert stats["datasets"]["time_whole"]["writes"] == 3
+
+    # Geometric growth: 1, 2, 4.
+    assert stats["resizes"]["time_step"]["count"] == 3
+
+    methods = [_i["name"] for _i in events if _i["type"] == "method"]
+    assert methods[0] == "put_coords"
+    assert set(_i["type"] for _i in events) == {
+        "method",
+        "read",
+        "write",
+        "resize",
+    }
+
+    with exodus(filename, mode="r") as e:
+        with pytest.raises(ValueError):
+            e.stats()
+        np.testing.assert_equal(
+            e.get_node_variable_values("u", 3), np.ones(5) * 3
+        )
+
+
+@pytest.mark.parametrize("write_queue_size", [0, 2])
+def test_live(tmpdir, io_size, write_queue_size):
+    filename = os.path.join(tmpdir.strpath, "example.e")
+
+    e = exodus(
+        filename,
+        mode="w",
+        title="Example",
+        array_type="numpy",
+        numDims=3,
+        numNodes=5,
+        numElems=6,
+        numBlocks=1,
+        numNodeSets=0,
+        numSideSets=1,
+        io_size=io_size["io_size"],
+        write_queue_size=write_queue_size,
+        live=True,
+        instrument=True,
+    )
+    e.put_coords(np.arange(5.0), np.arange(5.0), np.arange(5.0))
+    e.put_elem_blk_info(1, "HEX", 6, 3, 0)
+    e.set_node_variable_number(1)
+    e.put_node_variable_name("u", 1)
+    e.set_element_variable_number(1)
+    e.put_element_variable_name("v", 1)
+
+    e.put_time(1, 0.5)
+    e.put_node_variable_values("u", 1, np.ones(5))
+    e.put_element_variable_values(1, "v", 1, np.ones(6))
+    # Structural changes are no longer possible.
+    with pytest.raises(AssertionError):
+        e.set_global_variable_number(1)
+    e.flush()
+
+    r = exodus(filename, mode="r", live=True)
+    np.testing.assert_equal(r.get_times(), [0.5])
+    np.testing.assert_equal(r.get_node_variable_values("u", 1), np.ones(5))
+
+    # The second step is only visible once it is complete.
+    resizes = e.stats()["resizes"]["time_step"]["count"]
+    e.put_time(2, 1.0)
+    e.put_node_variable_values("u", 2, 2 * np.ones(5))
+    e.put_element_variable_values(1, "v", 2, 2 * np.ones(6))
+    e.flush()
+    # Growing the datasets and publishing the step are both recorded.
+    assert e.stats()["resizes"]["time_step"]["count"] == resizes + 1
+    assert e.stats()["resizes"]["time_whole"]["count"] == 2
+    assert r._num_steps == 1
+    with pytest.raises(ValueError):
+        r.get_node_variable_values("u", 2)
+    assert r.refresh() == 2
+    np.testing.assert_equal(r.get_times(), [0.5, 1.0])
+    np.testing.assert_equal(r.get_node_variable_values("u", 2), 2 * np.ones(5))
+    np.testing.assert_equal(
+        r.get_element_variable_values(1, "v", 2), 2 * np.ones(6)
+    )
+
+    # Starting the next step publishes the previous one.
+    e.put_time(3, 1.5)
+    e.put_node_variable_values("u", 3, 3 * np.ones(5))
+    e.put_time(4, 2.0)
+    # Waits for the background writes.
+    e.get_times()
+    assert r.refresh() == 3
+    np.testing.assert_equal(r.get_node_variable_values("u", 3), 3 * np.ones(5))
+
+    e.put_node_variable_values("u", 4, 4 * np.ones(5))
+    e.close()
+    assert r.refresh() == 4
+    np.testing.assert_equal(r.get_times(), [0.5, 1.0, 1.5, 2.0])
+    r.close()
+
+    with exodus(filename, mode="r") as r:
+        assert r._f.dimensions["time_step"] is None
+        assert r._f._current_dim_sizes["time_step"] == 4
+        np.testing.assert_equal(r.get_times(), [0.5, 1.0, 1.5, 2.0])
+        np.testing.assert_equal(
+            r.get_node_variable_history("u", [1]), [[1], [2], [3], [4]]
+        )
+
+
+def _subprocess_env():
+    """
+    Environment for Python subprocesses that can import this pyexodus.
+    """
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(pyexodus.__file__))
+    env["PYTHONPATH"] = os.pathsep.join(
+        [root] + [_i for _i in [env.get("PYTHONPATH")] if _i]
+    )
+    return env
+
+
+# Writes time steps in a separate process. Each line on stdin writes and
+# publishes the given number of additional steps, an empty line closes the
+# file.
+_LIVE_WRITER = """
+import sys
+import numpy as np
+from pyexodus import exodus
+
+e = exodus(
+    sys.argv[1], mode="w", title="Example", array_type="numpy", numDims=3,
+    numNodes=5, numElems=6, numBlocks=1, numNodeSets=0, numSideSets=0,
+    live=True,
+)
+e.put_coords(np.arange(5.0), np.arange(5.0), np.arange(5.0))
+e.put_elem_blk_info(1, "HEX", 6, 3, 0)
+e.set_node_variable_number(1)
+e.put_node_variable_name("u", 1)
+e.set_element_variable_number(1)
+e.put_element_variable_name("v", 1)
+step = 0
+for line in sys.stdin:
+    if not line.strip():
+        break
+    for _ in range(int(line)):
+        step += 1
+        e.put_time(step, float(step))
+        e.put_node_variable_values("u", step, step * np.ones(5))
+        e.put_element_variable_values(1, "v", step, step * np.ones(6))
+    e.flush()
+    print(step, flush=True)
+e.close()
+"""
+
+
+def test_live_other_process(tmpdir):
+    """
+    Readers in other processes have to refresh every dataset.
+    """
+    filename = os.path.join(tmpdir.strpath, "example.e")
+    p = subprocess.Popen(
+        [sys.executable, "-c", _LIVE_WRITER, filename],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        env=_subprocess_env(),
+        universal_newlines=True,
+    )
+
+    def write_steps(count):
+        p.stdin.write("%i\n" % count)
+        p.stdin.flush()
+        return int(p.stdout.readline())
+
+    try:
+        assert write_steps(1) == 1
+        with exodus(filename, mode="r", live=True) as r:
+            np.testing.assert_equal(r.get_times(), [1.0])
+            np.testing.assert_equal(
+                r.get_node_variable_values("u", 1), np.ones(5)
+            )
+
+            # Grows the datasets a couple of times.
+            assert write_steps(300) == 301
+            assert r.refresh() == 301
+            np.testing.assert_equal(r.get_times(), np.arange(1.0, 302.0))
+            np.testing.assert_equal(
+                r.get_node_variable_values("u", 301), 301 * np.ones(5)
+            )
+            np.testing.assert_equal(
+                r.get_element_variable_values(1, "v", 300), 300 * np.ones(6)
+            )
+            np.testing.assert_equal(
+                r.get_node_variable_history("u", [2])[:, 0],
+                np.arange(1.0, 302.0),
+            )
+        p.stdin.write("\n")
+        p.stdin.flush()
+        assert p.wait(timeout=60) == 0
+    finally:
+        if p.poll() is None:  # pragma: no cover
+            p.kill()
+        p.stdin.close()
+        p.stdout.close()
+
+    with exodus(filename, mode="r") as r:
+        np.testing.assert_equal(r.get_times(), np.arange(1.0, 302.0))
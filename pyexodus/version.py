@@ -38,20 +38,19 @@
 
 import io
 import os
-import inspect
-from subprocess import Popen, PIPE
 
 __all__ = "get_git_version"
 
 
-script_dir = os.path.abspath(
-    os.path.dirname(inspect.getfile(inspect.currentframe()))
-)
+script_dir = os.path.abspath(os.path.dirname(__file__))
 PYEXODUS_ROOT = os.path.abspath(os.path.join(script_dir, os.pardir))
 VERSION_FILE = os.path.join(script_dir, "RELEASE-VERSION")
 
 
 def call_git_describe(abbrev=4):  # pragma: no cover
+    # Only imported when actually needed to keep importing pyexodus fast.
+    from subprocess import Popen, PIPE
+
     try:
         p = Popen(
             ["git", "rev-parse", "--show-toplevel"],
@@ -62,6 +62,7 @@ setup_config = dict(
         "Topic :: Scientific/Engineering :: Physics",
     ],
     install_requires=["numpy", "h5netcdf >= 0.5.0"],
+    extras_require={"plugins": ["hdf5plugin"]},
     package_data={"pyexodus": get_package_data()},
 )
 